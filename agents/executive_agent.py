@@ -1,12 +1,19 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import inspect
 import json
+import os
+import time
+
+from core import tracing
 
 class ExecutiveAgent:
-    def __init__(self, llm, tools: List, memory, max_iterations: int = 5):
+    def __init__(self, llm, tools: List, memory, max_iterations: int = 5, trace_dir: Optional[str] = None):
         self.llm = llm
         self.tools = {tool.name: tool for tool in tools}
         self.memory = memory
         self.max_iterations = max_iterations
+        # One Chrome-trace JSON per run() is written here when set
+        self.trace_dir = trace_dir or os.environ.get("AURORA_TRACE_DIR")
 
     def plan(self, goal: str) -> List[str]:
         prompt = f"""You are AURORA Executive Agent. Break this goal into 3-5 executable steps.
@@ -27,3 +34,67 @@ Output: {output[:300]}...
 Check: 1) Correct? 2) Safe? 3) Complete?
 Respond in 3 bullet points."""
         return self.llm.generate(prompt, temperature=0.1)
+
+    def choose_action(self, goal: str, step: str) -> Dict[str, Any]:
+        tool_list = "\n".join(
+            f"- {name}{inspect.signature(tool.run)}" for name, tool in self.tools.items()
+        )
+        prompt = f"""You are AURORA Executive Agent. Pick ONE tool for this step, or "none" to answer directly.
+Goal: {goal}
+Step: {step}
+Tools:
+{tool_list}
+Respond ONLY as JSON: {{"tool": "<name or none>", "args": {{...}}}}"""
+        response = self.llm.generate(prompt, temperature=0.1)
+        try:
+            action = json.loads(response)
+            return {"tool": action.get("tool", "none"), "args": action.get("args") or {}}
+        except:
+            return {"tool": "none", "args": {}, "answer": response}
+
+    def run(self, goal: str) -> Dict[str, Any]:
+        """Plan, execute each step with a tool (or the LLM), store results in memory, self-audit"""
+        if not self.trace_dir:
+            return self._run(goal)
+        trace_path = os.path.join(self.trace_dir, f"agent-run-{time.time_ns()}.json")
+        with tracing.chrome_trace(trace_path):
+            return self._run(goal)
+
+    @tracing.traced("agent.run")
+    def _run(self, goal: str) -> Dict[str, Any]:
+        with tracing.span("agent.plan"):
+            steps = self.plan(goal)[:self.max_iterations]
+        outputs = []
+        for number, step in enumerate(steps, 1):
+            with tracing.span("agent.step", step=number):
+                outputs.append(self._run_step(goal, step, number))
+
+        final_output = outputs[-1]["output"] if outputs else ""
+        return {
+            "goal": goal,
+            "steps": [{"number": i, "description": step} for i, step in enumerate(steps, 1)],
+            "outputs": outputs,
+            "audit": self.self_audit(goal, "", final_output),
+        }
+
+    def _run_step(self, goal: str, step: str, number: int) -> Dict[str, Any]:
+        action = self.choose_action(goal, step)
+        tool = self.tools.get(action["tool"])
+        if tool is not None:
+            try:
+                result = tool.run(**action["args"])
+            except Exception as e:
+                result = {"error": str(e)}
+            success = "error" not in result and result.get("exit_code", 0) == 0
+            output = json.dumps(result)[:2000]
+        else:
+            output = action.get("answer") or self.llm.generate(f"Goal: {goal}\nStep: {step}\nComplete this step.")
+            success = True
+
+        if self.memory is not None:
+            self.memory.add_memory(
+                key=f"{goal}::step{number}",
+                content=f"{step}\n{output}",
+                metadata={"goal": goal, "step": step, "tool": action["tool"], "success": success}
+            )
+        return {"number": number, "tool": action["tool"], "success": success, "output": output}
@@ -11,6 +11,9 @@ import docker
 import tempfile
 import os
 import json
+from typing import Any, Dict
+
+from core import tracing
 
 class ShellTool:
     name = "shell"
@@ -26,6 +29,7 @@ class ShellTool:
             print("Pulling sandbox image...")
             self.client.images.pull("python:3.11-slim")
 
+    @tracing.traced("tool.run", tool="shell")
     def run(self, command: str, timeout: int = 30) -> Dict[str, Any]:
         """Run shell command safely"""
         if not self.sandboxed:
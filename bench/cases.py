@@ -0,0 +1,292 @@
+# bench/cases.py
+"""
+AURORA Bench Cases: micro + scenario benchmarks for the hot paths
+- AuroraBase generation, MemVault add/search, sandbox tools, WebBrowseTool
+- CoderX patch application, ExecutiveAgent end-to-end loop
+- VLX long-audio chunking + transcript merging over a synthetic waveform
+- Tracing overhead, disabled vs enabled
+- Forge distillation from a MemVault of agent traces
+- MemVault service throughput with concurrent clients on localhost
+Repo modules are imported inside setup, after bench.fakes.install() has run.
+"""
+
+import multiprocessing
+import random
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict
+
+import numpy as np
+
+from bench.harness import benchmark
+
+
+GOAL = "Fetch the Open-Meteo forecast for London and save a CSV summary."
+
+
+def _corpus(n: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    words = "agent plan code test shell browse memory vector patch diff london weather csv api python".split()
+    return [" ".join(rng.choice(words) for _ in range(24)) for _ in range(n)]
+
+
+def _base():
+    from core.aurora_base import AuroraBase
+    return AuroraBase(model_id="bench/fake-model", quantization="awq")
+
+
+def _vault(ctx: Dict[str, Any], name: str, preload: int = 0):
+    from core.aurora_memvault import AuroraMemVault
+    vault = AuroraMemVault(persist_dir=Path(ctx["tmpdir"]) / name, embedding_model="bench/fake-encoder")
+    for i, text in enumerate(_corpus(preload)):
+        vault.add_memory(key=f"seed-{i}", content=text, metadata={"i": i})
+    return vault
+
+
+# ---------------------------------------------------------------- micro
+
+@benchmark("base.generate")
+def base_generate(ctx):
+    llm = _base()
+    return lambda: llm.generate(f"Summarize: {GOAL}", max_tokens=128)
+
+
+@benchmark("base.generate_n8")
+def base_generate_n(ctx):
+    llm = _base()
+    return lambda: llm.generate_n(f"You are AURORA-CoderX.\nTask: {GOAL}", n=8)
+
+
+@benchmark("memvault.add")
+def memvault_add(ctx):
+    vault = _vault(ctx, "add", preload=200)
+    texts = _corpus(64, seed=1)
+    counter = iter(range(10 ** 9))
+
+    def op():
+        i = next(counter)
+        vault.add_memory(key=f"bench-{i}", content=texts[i % len(texts)], metadata={"i": i})
+        return vault.index.ntotal > 0
+    return op
+
+
+@benchmark("memvault.search")
+def memvault_search(ctx):
+    vault = _vault(ctx, "search", preload=2000)
+    return lambda: [hit["key"] for hit in vault.search("london weather csv python", k=5)]
+
+
+# The tool cases create and remove a temp dir per call: filesystem latency is spikier than CPU
+@benchmark("tools.shell_sandboxed", repeat=30)
+def shell_tool(ctx):
+    from agents.tools.shell_tool import ShellTool
+    tool = ShellTool(sandboxed=True)
+    return lambda: tool.run("echo aurora && ls", timeout=5)
+
+
+@benchmark("tools.code_executor", repeat=30)
+def code_executor(ctx):
+    from agents.tools.code_executor import CodeExecutorTool
+    tool = CodeExecutorTool()
+    return lambda: tool.run("print(sum(range(10)))", timeout=5)
+
+
+@benchmark("tools.web_browse", repeat=30)
+def web_browse(ctx):
+    from agents.tools.web_browse import WebBrowseTool
+    tool = WebBrowseTool(headless=True)
+    return lambda: tool.run("https://example.test/docs", max_wait=5)["title"]
+
+
+def _check_patching() -> None:
+    """Regression checks for hunk parsing + fuzzy application (run once, outside the timed region)"""
+    from coder.patching import FileView, apply_edits, parse_edits
+
+    # Model indented the hunk by 2 spaces where the file uses 4: the splice must follow the file
+    source = "def f(x):\n    if x:\n        return 1\n    return 0\n"
+    diff = "@@ -1,4 +1,5 @@\n def f(x):\n  if x:\n-    return 1\n+    y = x + 1\n+    return y\n  return 0\n"
+    result = apply_edits(FileView(source), *parse_edits(diff))
+    assert result.ok and result.content == "def f(x):\n    if x:\n        y = x + 1\n        return y\n    return 0\n", \
+        "whitespace-fuzzy hunk was spliced with the model's indentation"
+
+    # Removing a "-- comment" line reads as "--- comment": header counts keep it in the hunk
+    sql = "SELECT 1;\n-- comment\nSELECT 2;\n"
+    result = apply_edits(FileView(sql), *parse_edits("```diff\n@@ -1,3 +1,2 @@\n SELECT 1;\n--- comment\n SELECT 2;\n```"))
+    assert result.ok and result.content == "SELECT 1;\nSELECT 2;\n", "removal of a '--' line was dropped"
+
+
+@benchmark("coder.apply_edits")
+def coder_apply_edits(ctx):
+    from coder.patching import FileView, apply_edits, parse_edits
+    _check_patching()
+    functions = [f"def handler_{i}(x):\n    total = x + {i}\n    return total\n" for i in range(1500)]
+    view = FileView("\n".join(functions))
+    diff = "\n".join(
+        f"@@ -{i * 4 + 1},3 +{i * 4 + 1},3 @@\n def handler_{i}(x):\n-    total = x + {i}\n+    total = x * {i}\n     return total"
+        for i in range(0, 1500, 150)
+    )
+    hunks, symbols = parse_edits(diff + "\n```replace handler_7\ndef handler_7(x):\n    return -x\n```")
+    return lambda: apply_edits(view, hunks, symbols).applied
+
+
+def _speech_track(seconds: float, rng: np.random.Generator):
+    """Synthetic 16 kHz waveform: 12 s speech / 1 s silence, then 70 s of unbroken speech"""
+    from core.vlx_audio import SAMPLE_RATE
+    spans, t = [], 0.0
+    while t < seconds - 70:
+        spans.append((t, min(t + 12.0, seconds - 70)))
+        t += 13.0
+    spans.append((seconds - 70, seconds))
+
+    samples = rng.normal(0, 1e-3, int(seconds * SAMPLE_RATE)).astype(np.float32)
+    for start, end in spans:
+        i, j = int(start * SAMPLE_RATE), int(end * SAMPLE_RATE)
+        samples[i:j] += 0.3 * np.sin(np.arange(j - i) * 2 * np.pi * 220 / SAMPLE_RATE).astype(np.float32)
+    return samples, spans
+
+
+def _fake_whisper(chunk, spans):
+    """One word every 0.5 s of speech, named by absolute time, with chunk-relative timestamps"""
+    words = []
+    for start, end in spans:
+        for slot in range(int(max(start, chunk.start) * 2 + 0.999), int(min(end, chunk.start + chunk.duration) * 2)):
+            t = slot / 2 - chunk.start
+            if t + 0.4 <= chunk.duration:
+                words.append({"timestamp": (t, t + 0.4), "text": f"w{slot}"})
+    return {"chunks": words}
+
+
+def _check_audio_merge(merge, samples, spans) -> None:
+    """Regression checks for chunking + merging (run once, outside the timed region)"""
+    from core.vlx_audio import SAMPLE_RATE, AudioChunk, TranscriptMerger, array_blocks, chunk_audio
+
+    expected = [f"w{slot}" for start, end in spans for slot in range(int(start * 2 + 0.999), int(end * 2)) if slot / 2 + 0.4 <= end]
+    assert merge(samples).split() == expected, "merged transcript lost or duplicated words"
+
+    # A word repeated across a silence cut is real speech; across an overlapping hard cut it is a duplicate
+    def junction(keep_from: float) -> str:
+        merger = TranscriptMerger()
+        first = AudioChunk(np.zeros(SAMPLE_RATE * 10, dtype=np.float32), 0.0, 0.0, 10.0, True)
+        second = AudioChunk(np.zeros(SAMPLE_RATE * 10, dtype=np.float32), 9.0, keep_from, float("inf"), True)
+        texts = [seg.text for seg in merger.add(first, {"chunks": [{"timestamp": (9.0, 9.8), "text": "said no"}]})]
+        texts += [seg.text for seg in merger.add(second, {"chunks": [{"timestamp": (1.1, 1.9), "text": "no more"}]})]
+        return " ".join(texts)
+    assert junction(keep_from=9.0) == "said no no more", "silence-cut junction dropped a repeated word"
+    assert junction(keep_from=10.0) == "said no more", "hard-cut junction kept a duplicated word"
+
+    # Quiet recordings are still speech: no absolute loudness floor above speech_mask's
+    tone = 0.005 * np.sin(np.arange(40 * SAMPLE_RATE) * 2 * np.pi * 220 / SAMPLE_RATE).astype(np.float32)
+    assert all(chunk.has_speech for chunk in chunk_audio(array_blocks(tone))), "quiet audio was skipped as silence"
+
+
+@benchmark("audio.chunk_merge")
+def audio_chunk_merge(ctx):
+    from core.vlx_audio import TranscriptMerger, array_blocks, chunk_audio
+    samples, spans = _speech_track(180.0, np.random.default_rng(0))
+
+    def merge(samples):
+        merger = TranscriptMerger()
+        words = []
+        for chunk in chunk_audio(array_blocks(samples)):
+            if chunk.has_speech:
+                words.extend(seg.text for seg in merger.add(chunk, _fake_whisper(chunk, spans)))
+        return " ".join(words)
+
+    _check_audio_merge(merge, samples, spans)
+    return lambda: merge(samples)
+
+
+@benchmark("tracing.span_disabled")
+def tracing_span_disabled(ctx):
+    from core.tracing import Tracer
+    tracer = Tracer(enabled=False)
+
+    def op():
+        with tracer.span("llm.generate", model="bench") as span:
+            span.set(prompt_tokens=10, completion_tokens=20)
+    return op
+
+
+@benchmark("tracing.span_enabled")
+def tracing_span_enabled(ctx):
+    from core.tracing import Tracer
+    tracer = Tracer(enabled=True)
+
+    def op():
+        with tracer.span("llm.generate", model="bench") as span:
+            span.set(prompt_tokens=10, completion_tokens=20)
+    return op
+
+
+# ---------------------------------------------------------------- scenarios
+
+@benchmark("scenario.agent_run", kind="scenario", repeat=5)
+def agent_run(ctx):
+    from agents.executive_agent import ExecutiveAgent
+    from agents.tools.shell_tool import ShellTool
+    from agents.tools.web_browse import WebBrowseTool
+    agent = ExecutiveAgent(
+        llm=_base(),
+        tools=[ShellTool(sandboxed=True), WebBrowseTool(headless=True)],
+        memory=_vault(ctx, "agent", preload=100),
+        max_iterations=5
+    )
+    return lambda: [o["tool"] for o in agent.run(GOAL)["outputs"]]
+
+
+@benchmark("scenario.memvault_ingest_query", kind="scenario", repeat=3)
+def memvault_ingest_query(ctx):
+    texts = _corpus(200, seed=2)
+    queries = _corpus(50, seed=3)
+    runs = iter(range(10 ** 9))
+
+    def op():
+        vault = _vault(ctx, f"ingest-{next(runs)}")
+        for i, text in enumerate(texts):
+            vault.add_memory(key=f"m-{i}", content=text)
+        return sum(len(vault.search(q, k=5)) for q in queries)
+    return op
+
+
+@benchmark("scenario.forge_distill", kind="scenario", repeat=3)
+def forge_distill(ctx):
+    from forge.distill import DistillConfig, build_dataset
+    vault = _vault(ctx, "forge")
+    for i, text in enumerate(_corpus(500, seed=4)):
+        vault.add_memory(
+            key=f"trace-{i}", content=f"step {i % 5}\n{text}",
+            metadata={"goal": f"goal {i // 5}", "step": f"step {i % 5}", "tool": "none", "success": i % 4 != 0}
+        )
+    config = DistillConfig(tokenizer="bench/fake-model", dedup="minhash", buckets=[32, 64])
+    runs = iter(range(10 ** 9))
+    return lambda: build_dataset(vault.persist_dir, Path(ctx["tmpdir"]) / f"forge-{next(runs)}", config)["stats"]
+
+
+def _serve_memvault(persist_dir: Path, urls) -> None:
+    from core.aurora_memvault import AuroraMemVault
+    from core.memvault_service import MemVaultServer
+    vault = AuroraMemVault(persist_dir=persist_dir, embedding_model="bench/fake-encoder")
+    server = MemVaultServer(vault, port=0)
+    urls.put(server.url)
+    server.serve_forever()
+
+
+@benchmark("scenario.memvault_service", kind="scenario", repeat=3)
+def memvault_service(ctx):
+    from core.memvault_service import MemVaultClient
+    vault = _vault(ctx, "service", preload=2000)
+    vault.conn.close()
+
+    # Separate process, as in a deployment; fork keeps the fake backends installed
+    mp = multiprocessing.get_context("fork")
+    urls = mp.Queue()
+    mp.Process(target=_serve_memvault, args=(vault.persist_dir, urls), daemon=True).start()
+    url = urls.get(timeout=30)
+
+    clients = [MemVaultClient(url, cache_size=0) for _ in range(8)]
+    queries = _corpus(200, seed=5)
+    pool = ThreadPoolExecutor(max_workers=len(clients))
+
+    def client_run(i):
+        return [len(clients[i].search(q, k=5)) for q in queries[i::len(clients)]]
+    return lambda: sum(map(sum, pool.map(client_run, range(len(clients)))))
@@ -0,0 +1,413 @@
+# bench/fakes.py
+"""
+Deterministic stand-ins for heavy backends, so benchmarks run on a plain CPU box
+- vllm (LLM, SamplingParams) + transformers.AutoTokenizer: canned, prompt-routed completions
+- sentence_transformers.SentenceTransformer: feature-hashed bag-of-words embeddings
+- docker: containers that "run" instantly with canned output
+- playwright.sync_api: pages served from an in-process fake web
+- faiss / torch: only used when the real package is not installed
+
+Nothing here sleeps by default; set AURORA_BENCH_TOKEN_LATENCY (seconds per
+generated token) to simulate model latency in scenario runs.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import re
+import sys
+import time
+import types
+import zlib
+from typing import Any, Dict, List
+
+import numpy as np
+
+
+TOKEN_LATENCY_S = float(os.environ.get("AURORA_BENCH_TOKEN_LATENCY", "0"))
+WORDS = ("aurora agent memory vector sandbox tool plan step result output model token "
+         "image audio video patch diff test cache batch stream query index shard").split()
+
+
+def _seed(text: str) -> int:
+    return zlib.crc32(text.encode())
+
+
+def _words(seed: int, count: int) -> str:
+    return " ".join(WORDS[(seed + i * 7) % len(WORDS)] for i in range(count))
+
+
+# ---------------------------------------------------------------- vllm / transformers
+
+def fake_completion(prompt: str, max_tokens: int = 128, index: int = 0) -> str:
+    """Route on the repo's own prompt templates so callers parse realistic output"""
+    seed = _seed(prompt) + index
+    if '{"steps"' in prompt:
+        return json.dumps({"steps": [f"Step {i}: {_words(seed + i, 6)}" for i in range(1, 5)]})
+    if '"tool": "<name or none>"' in prompt:
+        step = re.search(r"Step: (.*)", prompt)
+        choice = _seed(step.group(1) if step else prompt) % 3
+        if choice == 0 and "- shell" in prompt:
+            return json.dumps({"tool": "shell", "args": {"command": "echo aurora"}})
+        if choice == 1 and "- web_browse" in prompt:
+            return json.dumps({"tool": "web_browse", "args": {"url": f"https://example.test/{seed % 97}"}})
+        return json.dumps({"tool": "none", "args": {}})
+    if "[SELF-AUDIT]" in prompt:
+        return "- Correct: yes\n- Safe: yes\n- Complete: yes"
+    if "AURORA-CoderX" in prompt:
+        return ("```python\ndef solve(x):\n    return x * 2\n```\n"
+                "```python\nfrom solution import solve\n\ndef test_solve():\n    assert solve(2) == 4\n```")
+    return _words(seed, min(max_tokens, 128))
+
+
+# Keyword arguments vLLM 0.5.4's SamplingParams accepts; anything else raises like the real one
+_SAMPLING_FIELDS = {
+    "n", "best_of", "presence_penalty", "frequency_penalty", "repetition_penalty", "temperature",
+    "top_p", "top_k", "min_p", "seed", "use_beam_search", "length_penalty", "early_stopping", "stop",
+    "stop_token_ids", "include_stop_str_in_output", "ignore_eos", "max_tokens", "min_tokens",
+    "logprobs", "prompt_logprobs", "detokenize", "skip_special_tokens",
+    "spaces_between_special_tokens", "logits_processors", "truncate_prompt_tokens",
+}
+
+
+class SamplingParams:
+    """Same constructor + clone() surface as vLLM 0.5.4 (no update())"""
+
+    def __init__(self, temperature: float = 1.0, top_p: float = 1.0, max_tokens: int = 16, n: int = 1, **kwargs):
+        unknown = set(kwargs) - _SAMPLING_FIELDS
+        if unknown:
+            raise TypeError(f"SamplingParams got unexpected keyword arguments: {sorted(unknown)}")
+        self.temperature = temperature
+        self.top_p = top_p
+        self.max_tokens = max_tokens
+        self.n = n
+        self.__dict__.update(kwargs)
+
+    def clone(self) -> "SamplingParams":
+        return SamplingParams(**dict(self.__dict__))
+
+
+class _CompletionOutput:
+    def __init__(self, index: int, text: str):
+        self.index = index
+        self.text = text
+        self.token_ids = list(range(len(text.split())))
+
+
+class _RequestOutput:
+    def __init__(self, prompt: str, outputs: List[_CompletionOutput]):
+        self.prompt = prompt
+        self.prompt_token_ids = list(range(len(prompt.split())))
+        self.outputs = outputs
+
+
+class LLM:
+    def __init__(self, model: str, **kwargs):
+        self.model = model
+        self.kwargs = kwargs
+
+    def generate(self, prompts: List[str], sampling_params: SamplingParams = None) -> List[_RequestOutput]:
+        sampling = sampling_params or SamplingParams()
+        results = []
+        for prompt in prompts:
+            outputs = [
+                _CompletionOutput(i, fake_completion(prompt, sampling.max_tokens, index=i))
+                for i in range(getattr(sampling, "n", 1))
+            ]
+            if TOKEN_LATENCY_S:
+                time.sleep(TOKEN_LATENCY_S * max(len(o.token_ids) for o in outputs))
+            results.append(_RequestOutput(prompt, outputs))
+        return results
+
+
+class AutoTokenizer:
+    chat_template = "{% for message in messages %}{{ message['content'] }}{% endfor %}"
+    padding_side = "right"
+
+    @classmethod
+    def from_pretrained(cls, model_id: str, **kwargs) -> "AutoTokenizer":
+        return cls()
+
+    def encode(self, text: str, **kwargs) -> List[int]:
+        return [_seed(word) % 50000 for word in text.split()]
+
+    def decode(self, ids: List[int], **kwargs) -> str:
+        return " ".join(WORDS[i % len(WORDS)] for i in ids)
+
+    def apply_chat_template(self, messages: List[Dict[str, Any]], tokenize: bool = False, **kwargs):
+        text = "\n".join(str(m.get("content", "")) for m in messages)
+        return self.encode(text) if tokenize else text
+
+
+# ---------------------------------------------------------------- sentence_transformers
+
+class SentenceTransformer:
+    def __init__(self, model_name: str = "", dim: int = 384, **kwargs):
+        self.model_name = model_name
+        self.dim = dim
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dim
+
+    def encode(self, sentences, batch_size: int = 32, **kwargs) -> np.ndarray:
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in text.lower().split():
+                h = _seed(token)
+                out[row, h % self.dim] += 1.0 if (h >> 16) & 1 else -1.0
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        out /= np.maximum(norms, 1e-12)
+        return out[0] if single else out
+
+
+# ---------------------------------------------------------------- faiss (fallback only)
+
+class IndexFlatL2:
+    def __init__(self, d: int):
+        self.d = d
+        self.xb = np.zeros((0, d), dtype=np.float32)
+
+    @property
+    def ntotal(self) -> int:
+        return len(self.xb)
+
+    def add(self, x: np.ndarray) -> None:
+        self.xb = np.vstack([self.xb, np.asarray(x, dtype=np.float32).reshape(-1, self.d)])
+
+    def search(self, x: np.ndarray, k: int):
+        x = np.asarray(x, dtype=np.float32).reshape(-1, self.d)
+        d2 = (x * x).sum(1)[:, None] - 2 * x @ self.xb.T + (self.xb * self.xb).sum(1)[None, :]
+        k_eff = min(k, self.ntotal)
+        order = np.argsort(d2, axis=1, kind="stable")[:, :k_eff]
+        distances = np.take_along_axis(d2, order, axis=1)
+        pad = k - k_eff
+        if pad:
+            distances = np.hstack([distances, np.full((len(x), pad), np.inf, dtype=np.float32)])
+            order = np.hstack([order, np.full((len(x), pad), -1)])
+        return distances.astype(np.float32), order.astype(np.int64)
+
+
+class IndexIDMap2:
+    def __init__(self, index: IndexFlatL2):
+        self.index = index
+        self.ids = np.zeros(0, dtype=np.int64)
+
+    @property
+    def ntotal(self) -> int:
+        return self.index.ntotal
+
+    def add_with_ids(self, x: np.ndarray, ids: np.ndarray) -> None:
+        self.index.add(x)
+        self.ids = np.concatenate([self.ids, np.asarray(ids, dtype=np.int64)])
+
+    def remove_ids(self, ids: np.ndarray) -> int:
+        keep = ~np.isin(self.ids, np.asarray(ids, dtype=np.int64))
+        removed = int((~keep).sum())
+        self.index.xb = self.index.xb[keep]
+        self.ids = self.ids[keep]
+        return removed
+
+    def search(self, x: np.ndarray, k: int):
+        distances, positions = self.index.search(x, k)
+        labels = np.where(positions >= 0, self.ids[np.maximum(positions, 0)], -1)
+        return distances, labels
+
+
+def write_index(index: Any, path: str) -> None:
+    with open(path, "wb") as f:
+        pickle.dump(index, f)
+
+
+def read_index(path: str) -> Any:
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+# ---------------------------------------------------------------- docker
+
+class _ImageNotFound(Exception):
+    pass
+
+
+class _FakeContainer:
+    def __init__(self, command: List[str]):
+        digest = hashlib.sha1(" ".join(map(str, command)).encode()).hexdigest()[:8]
+        self._stdout = f"ok {digest}\n".encode()
+
+    def wait(self, timeout: float = None) -> Dict[str, int]:
+        return {"StatusCode": 0}
+
+    def logs(self, stdout: bool = True, stderr: bool = True) -> bytes:
+        return self._stdout if stdout else b""
+
+    def kill(self) -> None:
+        pass
+
+    def remove(self, force: bool = False) -> None:
+        pass
+
+
+class _Containers:
+    def run(self, image: str, command: List[str] = None, **kwargs) -> _FakeContainer:
+        return _FakeContainer(command or [])
+
+
+class _Images:
+    def get(self, name: str) -> str:
+        return name
+
+    def pull(self, name: str) -> str:
+        return name
+
+
+class _DockerClient:
+    def __init__(self):
+        self.containers = _Containers()
+        self.images = _Images()
+
+
+def docker_from_env() -> _DockerClient:
+    return _DockerClient()
+
+
+# ---------------------------------------------------------------- playwright
+
+def fake_page_html(url: str) -> str:
+    seed = _seed(url)
+    paragraphs = "".join(f"<p>{_words(seed + i, 40)}</p>" for i in range(20))
+    return f"<html><head><title>Page {seed % 1000}</title></head><body><h1>{url}</h1>{paragraphs}</body></html>"
+
+
+class _Request:
+    def __init__(self, resource_type: str):
+        self.resource_type = resource_type
+
+
+class _Route:
+    def __init__(self, resource_type: str):
+        self.request = _Request(resource_type)
+        self.handled = None
+
+    def abort(self) -> None:
+        self.handled = "abort"
+
+    def continue_(self) -> None:
+        self.handled = "continue"
+
+
+class _Page:
+    SUBRESOURCES = ("document", "script", "image", "stylesheet", "font", "xhr")
+
+    def __init__(self):
+        self._handlers = []
+        self._html = ""
+
+    def route(self, pattern: str, handler) -> None:
+        self._handlers.append(handler)
+
+    def goto(self, url: str, timeout: float = None) -> None:
+        self._html = fake_page_html(url)
+        for resource_type in self.SUBRESOURCES:
+            for handler in self._handlers:
+                handler(_Route(resource_type))
+
+    def wait_for_load_state(self, state: str = "load", timeout: float = None) -> None:
+        pass
+
+    def title(self) -> str:
+        return re.search(r"<title>(.*?)</title>", self._html).group(1)
+
+    def inner_text(self, selector: str) -> str:
+        return re.sub(r"<[^>]+>", "\n", self._html.split("<body>", 1)[-1]).strip()
+
+    def content(self) -> str:
+        return self._html
+
+
+class _Browser:
+    def new_page(self) -> _Page:
+        return _Page()
+
+    def close(self) -> None:
+        pass
+
+
+class _Chromium:
+    def launch(self, headless: bool = True) -> _Browser:
+        return _Browser()
+
+
+class _Playwright:
+    chromium = _Chromium()
+
+    def __enter__(self) -> "_Playwright":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+def sync_playwright() -> _Playwright:
+    return _Playwright()
+
+
+# ---------------------------------------------------------------- installation
+
+def _module(name: str, **attrs) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    module.__aurora_fake__ = True
+    return module
+
+
+def _importable(name: str) -> bool:
+    try:
+        __import__(name)
+        return True
+    except ImportError:
+        return False
+
+
+def install(force: bool = True) -> Dict[str, str]:
+    """Register stand-ins in sys.modules; returns which backend each dependency resolved to.
+
+    force=True always fakes the model/encoder/Docker/HTTP backends so numbers are
+    reproducible; faiss and torch stay real whenever they are installed.
+    """
+    backends = {}
+
+    def use_fake(name: str, modules: Dict[str, types.ModuleType]) -> None:
+        if force or not _importable(name):
+            sys.modules.update(modules)
+            backends[name] = "fake"
+        else:
+            backends[name] = "real"
+
+    use_fake("vllm", {"vllm": _module("vllm", LLM=LLM, SamplingParams=SamplingParams)})
+    use_fake("transformers", {"transformers": _module("transformers", AutoTokenizer=AutoTokenizer)})
+    use_fake("sentence_transformers", {
+        "sentence_transformers": _module("sentence_transformers", SentenceTransformer=SentenceTransformer),
+    })
+    errors = _module("docker.errors", ImageNotFound=_ImageNotFound, NotFound=_ImageNotFound)
+    use_fake("docker", {"docker": _module("docker", from_env=docker_from_env, errors=errors), "docker.errors": errors})
+    sync_api = _module("playwright.sync_api", sync_playwright=sync_playwright)
+    use_fake("playwright", {"playwright": _module("playwright", sync_api=sync_api), "playwright.sync_api": sync_api})
+
+    # Real implementations whenever available: these are part of what we measure
+    if _importable("faiss"):
+        backends["faiss"] = "real"
+    else:
+        sys.modules["faiss"] = _module(
+            "faiss", IndexFlatL2=IndexFlatL2, IndexIDMap2=IndexIDMap2, write_index=write_index, read_index=read_index
+        )
+        backends["faiss"] = "fake"
+    if _importable("torch"):
+        backends["torch"] = "real"
+    else:
+        cuda = _module("torch.cuda", is_available=lambda: False)
+        sys.modules.update({"torch": _module("torch", cuda=cuda), "torch.cuda": cuda})
+        backends["torch"] = "fake"
+    return backends
@@ -0,0 +1,145 @@
+# bench/harness.py
+"""
+AURORA Bench Harness: timing, registry and baseline comparison
+- Benchmarks register with @benchmark; setup runs outside the timed region
+- Each sample times `number` calls (auto-calibrated so a sample is >= min_sample_s)
+- Results are plain dicts, ready for JSON
+- Comparisons use each run's fastest sample against per-kind tolerances, scaled by a
+  run-level CPU calibration workload so baselines carry across machines
+- A changed output digest is a failure too: behaviour changes need --update-baseline
+"""
+
+import gc
+import hashlib
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+BENCHMARKS: Dict[str, Dict[str, Any]] = {}
+DEFAULT_TOLERANCE = {"micro": 0.4, "scenario": 0.5}  # allowed slowdown of the fastest sample
+
+
+def benchmark(name: str, kind: str = "micro", repeat: Optional[int] = None, tolerance: Optional[float] = None):
+    """Register `setup(ctx) -> op`; only op() is timed. tolerance overrides the kind's default"""
+    def register(setup: Callable):
+        BENCHMARKS[name] = {"setup": setup, "kind": kind, "repeat": repeat, "tolerance": tolerance}
+        return setup
+    return register
+
+
+def tolerance_for(name: str, override: Optional[float] = None) -> float:
+    spec = BENCHMARKS[name]
+    if override is not None:
+        return override
+    return spec["tolerance"] if spec["tolerance"] is not None else DEFAULT_TOLERANCE[spec["kind"]]
+
+
+def digest(value: Any) -> str:
+    """Short fingerprint of an op's output, to spot behaviour changes alongside timing ones"""
+    return hashlib.sha1(repr(value).encode()).hexdigest()[:12]
+
+
+def _percentile(samples: List[float], q: float) -> float:
+    ordered = sorted(samples)
+    position = (len(ordered) - 1) * q
+    low, high = int(position), min(int(position) + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def measure(op: Callable[[], Any], repeat: int = 20, warmup: int = 2, min_sample_s: float = 0.01) -> Dict[str, Any]:
+    """Time op() and return per-call statistics in seconds"""
+    last = None
+    for _ in range(warmup):
+        last = op()
+
+    # Calibrate how many calls make one measurable sample
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            last = op()
+        if time.perf_counter() - started >= min_sample_s or number >= 1 << 16:
+            break
+        number *= 2
+
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(number):
+                last = op()
+            samples.append((time.perf_counter() - started) / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    median = statistics.median(samples)
+    return {
+        "repeat": repeat,
+        "number": number,
+        "mean_s": statistics.fmean(samples),
+        "median_s": median,
+        "p95_s": _percentile(samples, 0.95),
+        "min_s": min(samples),
+        "max_s": max(samples),
+        "stdev_s": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "ops_per_s": 1.0 / median if median else float("inf"),
+        "digest": digest(last),
+    }
+
+
+def _calibration_op() -> int:
+    # Fixed interpreter-bound work: hashing, dict/list churn, sorting
+    h = hashlib.sha256()
+    table = {}
+    for i in range(3000):
+        key = str(i * 7919 % 3001)
+        h.update(key.encode())
+        table[key] = table.get(key, 0) + i
+    return len(sorted(table.items(), key=lambda kv: kv[1]))
+
+
+def calibrate(repeat: int = 9) -> float:
+    """Fastest seconds of a fixed CPU workload; ratios against it factor out machine speed"""
+    return measure(_calibration_op, repeat=repeat, warmup=3)["min_s"]
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerances: Dict[str, float],
+    scale: float = 1.0,
+) -> Dict[str, Dict[str, Any]]:
+    """Fastest-sample ratio vs baseline per benchmark; status is ok / regression / improvement / new.
+
+    The min is used because noise only ever adds time. Baseline times are multiplied by
+    `scale` (this machine's calibration time / the baseline's); tolerances maps benchmark
+    name to its allowed slowdown.
+    """
+    comparison = {}
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            comparison[name] = {"status": "new"}
+            continue
+        tolerance = tolerances[name]
+        ratio = result["min_s"] / (base["min_s"] * scale) if base["min_s"] else float("inf")
+        if ratio > 1 + tolerance:
+            status = "regression"
+        elif ratio < 1 / (1 + tolerance):
+            status = "improvement"
+        else:
+            status = "ok"
+        comparison[name] = {
+            "status": status,
+            "ratio": round(ratio, 3),
+            "tolerance": tolerance,
+            "baseline_min_s": base["min_s"],
+            "min_s": result["min_s"],
+            "median_s": result["median_s"],
+            "output_changed": base.get("digest") != result["digest"],
+        }
+    return comparison
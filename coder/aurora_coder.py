@@ -7,12 +7,23 @@ AURORA-CoderX: AI-Powered Code Generation, Testing & Patching
 - Executes safely in Docker sandbox
 """
 
+import contextvars
 import os
+import re
 import json
-from typing import Dict, Any, Optional
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Tuple
 from pydantic import BaseModel
 from core.aurora_base import AuroraBase
 from agents.tools.code_executor import CodeExecutorTool
+from coder.sandbox import PYTEST_UNAVAILABLE, CodeSandbox
+from coder.patching import FileViewCache, FileView, Hunk, SymbolEdit, apply_edits, parse_edits
+
+
+CODE_BLOCK_RE = re.compile(r"```[\w+-]*\n(.*?)```", re.DOTALL)
 
 
 class CodeGenerationResult(BaseModel):
@@ -24,10 +35,75 @@ class CodeGenerationResult(BaseModel):
     error: Optional[str] = None
 
 
+class BestOfNResult(BaseModel):
+    """Outcome of best-of-n generation with execution-based selection"""
+    best: Optional[CodeGenerationResult] = None
+    candidates: List[CodeGenerationResult] = []
+    n: int
+    evaluated: int = 0
+    passed: int = 0
+    # None when select="first" stopped early: the stop depends on a pass, biasing pass@k upward
+    pass_at_k: Optional[Dict[int, float]] = None
+    generation_time_s: float = 0.0
+    wall_time_s: float = 0.0
+
+
+def pass_at_k(n: int, c: int, k: int) -> float:
+    """Unbiased pass@k estimate from n samples with c correct (Chen et al., 2021)"""
+    if n - c < k:
+        return 1.0
+    return 1.0 - math.comb(n - c, k) / math.comb(n, k)
+
+
+def parse_code_response(response: str) -> Tuple[str, str]:
+    """Split a model response into (code, tests) using its fenced code blocks"""
+    blocks = [block.strip() for block in CODE_BLOCK_RE.findall(response)]
+    if not blocks:
+        return response.strip(), ""
+    tests = next((block for block in blocks if "def test" in block), "")
+    code = next((block for block in blocks if block is not tests), "")
+    return code, tests
+
+
+def score_test_run(execution_result: Dict[str, Any]) -> float:
+    """Fraction of tests passed, read from the pytest / fallback runner summary"""
+    output = execution_result.get("stdout", "")
+    passed = sum(int(m) for m in re.findall(r"(\d+) passed", output))
+    failed = sum(int(m) for m in re.findall(r"(\d+) (?:failed|error)", output))
+    if passed + failed == 0:
+        return 0.0
+    return passed / (passed + failed)
+
+
 class AuroraCoder:
-    def __init__(self, llm: AuroraBase):
+    def __init__(self, llm: AuroraBase, max_parallel_sandboxes: int = 4):
         self.llm = llm
         self.executor = CodeExecutorTool()
+        self.sandbox = CodeSandbox()
+        self.max_parallel_sandboxes = max_parallel_sandboxes
+        self.files = FileViewCache()
+
+    def _code_prompt(self, task: str, language: str, include_tests: bool) -> str:
+        return f"""You are AURORA-CoderX, an expert code generator.
+Task: {task}
+Language: {language}
+include_tests={include_tests}
+
+Generate ONLY the code (no explanations). If include_tests=True, also generate a Pytest file.
+The code is saved as solution.py; tests must import from `solution`.
+
+Example for 'add two numbers':
+```python
+def add(a, b):
+    return a + b
+```
+```python
+from solution import add
+
+def test_add():
+    assert add(2, 3) == 5
+```
+"""
 
     def generate_code(
         self,
@@ -37,13 +113,189 @@ class AuroraCoder:
         max_tokens: int = 2048
     ) -> CodeGenerationResult:
         """Generate code from natural language task"""
-        prompt = f"""You are AURORA-CoderX, an expert code generator.
-Task: {task}
-Language: {language}
+        try:
+            response = self.llm.generate(self._code_prompt(task, language, include_tests), max_tokens=max_tokens)
+            code, tests = parse_code_response(response)
+            return CodeGenerationResult(code=code, tests=tests if include_tests else "")
+        except Exception as e:
+            return CodeGenerationResult(code="", error=str(e))
 
-Generate ONLY the code (no explanations). If include_tests=True, also generate a Pytest file.
+    def _evaluate(self, candidate: CodeGenerationResult, timeout: int, cancel: threading.Event) -> Dict[str, Any]:
+        if cancel.is_set():
+            return {"stdout": "", "stderr": "cancelled", "exit_code": -2}
+        return self.sandbox.run_pytest(candidate.code, candidate.tests, timeout=timeout, cancel=cancel)
 
-Example for 'add two numbers':
-```python
-def add(a, b):
-    return a + b
+    def generate_best_of_n(
+        self,
+        task: str,
+        n: int = 4,
+        language: str = "python",
+        select: str = "first",  # "first" passing candidate, or "best" after running all
+        temperature: float = 0.8,
+        max_tokens: int = 2048,
+        timeout: int = 60,
+    ) -> BestOfNResult:
+        """Sample n candidates in one batched call and pick one by running its own tests.
+
+        Candidate test suites run concurrently (up to max_parallel_sandboxes
+        containers). With select="first", the remaining runs are cancelled as
+        soon as one candidate passes, and pass@k is not reported for that run.
+        """
+        started = time.perf_counter()
+        responses = self.llm.generate_n(
+            self._code_prompt(task, language, include_tests=True),
+            n=n,
+            temperature=temperature,
+            max_tokens=max_tokens
+        )
+        generation_time = time.perf_counter() - started
+
+        candidates = []
+        for response in responses:
+            code, tests = parse_code_response(response)
+            candidates.append(CodeGenerationResult(
+                code=code,
+                tests=tests,
+                error=None if tests else "No tests generated"
+            ))
+
+        cancel = threading.Event()
+        evaluated = passed = 0
+        first_passing = None
+        stopped_early = False
+        workers = max(1, min(n, self.max_parallel_sandboxes))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="coder-sandbox") as pool:
+            futures = {
+                # Copy the context per task so sandbox spans land in the caller's trace
+                pool.submit(contextvars.copy_context().run, self._evaluate, candidate, timeout, cancel): candidate
+                for candidate in candidates if candidate.tests
+            }
+            for future in as_completed(futures):
+                candidate = futures[future]
+                result = future.result()
+                if result.get("exit_code") in (-2, PYTEST_UNAVAILABLE):
+                    continue  # cancelled, or the sandbox couldn't run this suite: not evaluated
+                candidate.execution_result = result
+                evaluated += 1
+                if result.get("exit_code") == 0:
+                    passed += 1
+                    first_passing = first_passing or candidate
+                    if select == "first":
+                        print(f"✅ Candidate passed after {time.perf_counter() - started:.1f}s, cancelling the rest")
+                        cancel.set()
+                        stopped_early = True
+                        for other in futures:
+                            other.cancel()
+                        break
+
+        scored = [c for c in candidates if c.execution_result]
+        if select == "first" and first_passing is not None:
+            best = first_passing
+        elif scored:
+            best = max(scored, key=lambda c: (c.execution_result["exit_code"] == 0, score_test_run(c.execution_result), -len(c.code)))
+        else:
+            best = candidates[0] if candidates else None
+
+        return BestOfNResult(
+            best=best,
+            candidates=candidates,
+            n=n,
+            evaluated=evaluated,
+            passed=passed,
+            pass_at_k={k: round(pass_at_k(evaluated, passed, k), 4) for k in range(1, evaluated + 1)}
+            if not stopped_early else None,
+            generation_time_s=round(generation_time, 3),
+            wall_time_s=round(time.perf_counter() - started, 3),
+        )
+
+    def _numbered(self, view: FileView, start: int = 0, end: Optional[int] = None) -> str:
+        end = len(view.lines) if end is None else min(end, len(view.lines))
+        return "\n".join(f"{i + 1:>5} | {view.lines[i]}" for i in range(max(0, start), end))
+
+    def _edit_prompt(self, view: FileView, instruction: str) -> str:
+        return f"""You are AURORA-CoderX, editing an existing file. Do NOT rewrite the whole file.
+File: {os.path.basename(view.path)}
+Instruction: {instruction}
+
+Respond ONLY with edits, in either (or both) of these forms:
+1) Unified diff hunks with 3 lines of context:
+@@ -<old_line>,<old_count> +<new_line>,<new_count> @@
+ context
+-removed
++added
+2) Whole-symbol replacement for a function/class/method (qualified name, e.g. MyClass.method):
+```replace MyClass.method
+def method(self):
+    ...
+```
+
+Current file (line numbers are for reference only, not part of the file):
+{self._numbered(view)}
+"""
+
+    def _retry_prompt(self, view: FileView, instruction: str, hunks: List[Hunk], symbols: List[SymbolEdit]) -> str:
+        excerpts = []
+        for hunk in hunks:
+            center = max(0, hunk.old_start - 1)
+            excerpts.append(f"Failed hunk:\n{hunk.text()}\nFile around line {center + 1}:\n{self._numbered(view, center - 15, center + 15)}")
+        for edit in symbols:
+            excerpts.append(f"Unknown symbol `{edit.symbol}`. Available: {', '.join(sorted(view.symbols)) or '(none)'}")
+        failures = "\n\n".join(excerpts)
+        return f"""You are AURORA-CoderX. Some of your edits for this instruction did not apply; the rest already have.
+File: {os.path.basename(view.path)}
+Instruction: {instruction}
+
+{failures}
+
+Regenerate ONLY the failed edits against the current file content shown with each failure, in the same format
+(unified diff hunks with exact context lines, or ```replace <symbol>``` blocks)."""
+
+    def edit_file(
+        self,
+        path: str,
+        instruction: str,
+        max_retries: int = 2,
+        max_fuzz: int = 2,
+        max_tokens: int = 1024
+    ) -> CodeGenerationResult:
+        """Edit a file in place via diff hunks / AST-anchored replacements instead of regenerating it.
+
+        Hunks that fail to apply are sent back to the model on their own (with the
+        surrounding lines) up to max_retries times; successful edits are kept.
+        """
+        try:
+            view = self.files.get(path)
+            original = view.content
+            response = self.llm.generate(self._edit_prompt(view, instruction), max_tokens=max_tokens)
+            responses = [response]
+            hunks, symbols = parse_edits(response)
+            if not hunks and not symbols:
+                return CodeGenerationResult(code=response, error="No diff hunks or symbol edits in model output")
+
+            for attempt in range(max_retries + 1):
+                result = apply_edits(view, hunks, symbols, max_fuzz=max_fuzz)
+                if result.content != view.content:
+                    view = FileView(result.content, view.path)
+                if result.ok or attempt == max_retries:
+                    break
+                print(f"🔁 Retrying {len(result.failed_hunks) + len(result.failed_symbols)} failed edit(s)")
+                response = self.llm.generate(
+                    self._retry_prompt(view, instruction, result.failed_hunks, result.failed_symbols),
+                    max_tokens=max_tokens
+                )
+                responses.append(response)
+                hunks, symbols = parse_edits(response)
+                if not hunks and not symbols:
+                    break
+
+            if view.content != original:
+                self.files.write(path, view.content)
+
+            failed = [h.text() for h in result.failed_hunks] + [f"replace {e.symbol}" for e in result.failed_symbols]
+            return CodeGenerationResult(
+                code="\n\n".join(responses),
+                patch_applied=result.ok,
+                error=f"{len(failed)} edit(s) failed to apply:\n" + "\n".join(failed) if failed else None
+            )
+        except Exception as e:
+            return CodeGenerationResult(code="", error=str(e))
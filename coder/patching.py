@@ -0,0 +1,332 @@
+# coder/patching.py
+"""
+AURORA-CoderX Patching: Incremental edits instead of whole-file rewrites
+- Parses unified-diff hunks and AST-anchored symbol replacements from model output
+- Locates hunks with fuzzy matching (offset search, whitespace-insensitive, reduced context)
+- Uses a cached, parsed view of each target file (line index + Python symbol table)
+- Reports exactly which hunks failed so only those are regenerated
+"""
+
+import ast
+import os
+import re
+import tempfile
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+
+class Hunk(BaseModel):
+    """One @@ hunk: lines prefixed with ' ', '-' or '+'"""
+    old_start: int = 0  # 1-based, 0 if unknown
+    lines: List[str] = []
+    header: str = ""
+
+    @property
+    def old_lines(self) -> List[str]:
+        return [line[1:] for line in self.lines if line[:1] in (" ", "-")]
+
+    @property
+    def new_lines(self) -> List[str]:
+        return [line[1:] for line in self.lines if line[:1] in (" ", "+")]
+
+    def text(self) -> str:
+        return "\n".join([self.header] + self.lines)
+
+
+class SymbolEdit(BaseModel):
+    """Replace a whole function/class, addressed by qualified name (e.g. 'Foo.bar')"""
+    symbol: str
+    code: str
+
+
+class PatchResult(BaseModel):
+    """Outcome of applying a set of edits to one file's content"""
+    content: str
+    applied: int = 0
+    failed_hunks: List[Hunk] = []
+    failed_symbols: List[SymbolEdit] = []
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed_hunks and not self.failed_symbols
+
+
+HUNK_HEADER_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+\d+(?:,(\d+))? @@")
+SYMBOL_EDIT_RE = re.compile(r"```replace[ \t]+([\w.]+)[^\n]*\n(.*?)```", re.DOTALL)
+
+
+def parse_edits(response: str) -> Tuple[List[Hunk], List[SymbolEdit]]:
+    """Extract unified-diff hunks and ```replace <symbol>``` blocks from a model response.
+
+    Inside a hunk the header's line counts decide how many body lines belong to it, so
+    removed lines that themselves start with "--" or "++" are kept. File headers
+    (---/+++), diff/index lines and fences are only recognised once those counts run out.
+    """
+    symbols = [SymbolEdit(symbol=name, code=code.rstrip("\n")) for name, code in SYMBOL_EDIT_RE.findall(response)]
+    lines = SYMBOL_EDIT_RE.sub("", response).splitlines()
+
+    hunks: List[Hunk] = []
+    current: Optional[Hunk] = None
+    old_left = new_left = None  # remaining counts from the header; None if it had none
+    for i, line in enumerate(lines):
+        if line.startswith("@@"):
+            match = HUNK_HEADER_RE.match(line)
+            current = Hunk(old_start=int(match.group(1)) if match else 0, header=line)
+            hunks.append(current)
+            if match:
+                old_left = int(match.group(2)) if match.group(2) is not None else 1
+                new_left = int(match.group(3)) if match.group(3) is not None else 1
+            else:
+                old_left = new_left = None
+            continue
+        if current is None:
+            continue
+
+        counted = old_left is not None and (old_left > 0 or new_left > 0)
+        if counted and line[:1] in (" ", "-", "+", ""):
+            body = line or " "  # blank context line that lost its leading space
+            current.lines.append(body)
+            if body[0] != "+":
+                old_left -= 1
+            if body[0] != "-":
+                new_left -= 1
+            continue
+
+        # Outside the counted body (or no counts): tolerate miscounted hunks, but stop at headers
+        next_line = lines[i + 1] if i + 1 < len(lines) else ""
+        if line.startswith(("diff ", "index ")) or (line.startswith("---") and next_line.startswith("+++")):
+            current = None
+        elif line.startswith("```") or line.startswith(("\\", "+++")):
+            continue
+        elif line[:1] in (" ", "-", "+"):
+            current.lines.append(line)
+        elif line == "" and old_left is None:
+            current.lines.append(" ")
+    return [h for h in hunks if h.lines], symbols
+
+
+def _norm_rstrip(line: str) -> str:
+    return line.rstrip()
+
+
+def _norm_strip(line: str) -> str:
+    return " ".join(line.split())
+
+
+class FileView:
+    """Parsed view of one file's content, reused across edits until the file changes"""
+
+    def __init__(self, content: str, path: str = "", stamp: Tuple[int, int] = (0, 0)):
+        self.path = path
+        self.stamp = stamp
+        self.content = content
+        self.lines = content.split("\n")
+        self._index: Dict[str, Dict[str, List[int]]] = {}
+        self._symbols: Optional[Dict[str, Tuple[int, int]]] = None
+
+    def positions(self, line: str, normalize) -> List[int]:
+        """Line numbers (0-based) whose normalized text equals normalize(line)"""
+        index = self._index.get(normalize.__name__)
+        if index is None:
+            index = {}
+            for i, text in enumerate(self.lines):
+                index.setdefault(normalize(text), []).append(i)
+            self._index[normalize.__name__] = index
+        return index.get(normalize(line), [])
+
+    @property
+    def symbols(self) -> Dict[str, Tuple[int, int]]:
+        """Qualified name -> (start, end) line span (0-based, end exclusive, decorators included)"""
+        if self._symbols is None:
+            self._symbols = {}
+            try:
+                tree = ast.parse(self.content)
+            except SyntaxError:
+                return self._symbols
+            self._collect(tree, "")
+        return self._symbols
+
+    def _collect(self, node: ast.AST, prefix: str) -> None:
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                name = f"{prefix}{child.name}"
+                start = min([child.lineno] + [d.lineno for d in child.decorator_list]) - 1
+                self._symbols[name] = (start, child.end_lineno)
+                self._collect(child, f"{name}.")
+
+    def locate(self, needle: List[str], hint: int, normalize) -> Optional[int]:
+        """Start line of `needle`, preferring the match closest to `hint`"""
+        if not needle:
+            return max(0, min(hint, len(self.lines)))
+        anchor = next((i for i, line in enumerate(needle) if line.strip()), 0)
+        key = [normalize(line) for line in needle]
+        candidates = [p - anchor for p in self.positions(needle[anchor], normalize)]
+        for start in sorted(candidates, key=lambda s: abs(s - hint)):
+            if start < 0 or start + len(needle) > len(self.lines):
+                continue
+            if [normalize(line) for line in self.lines[start:start + len(needle)]] == key:
+                return start
+        return None
+
+
+class FileViewCache:
+    """LRU of FileViews, invalidated by mtime/size"""
+
+    def __init__(self, max_files: int = 64):
+        self.max_files = max_files
+        self._views: "OrderedDict[str, FileView]" = OrderedDict()
+
+    def get(self, path: str) -> FileView:
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        view = self._views.get(path)
+        if view is None or view.stamp != stamp:
+            with open(path, "r") as f:
+                view = FileView(f.read(), path, stamp)
+            self._views[path] = view
+        self._views.move_to_end(path)
+        while len(self._views) > self.max_files:
+            self._views.popitem(last=False)
+        return view
+
+    def write(self, path: str, content: str) -> FileView:
+        """Atomically replace the file and refresh its cached view"""
+        path = os.path.abspath(path)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".aurora-patch-")
+        with os.fdopen(fd, "w") as f:
+            f.write(content)
+        if os.path.exists(path):
+            os.chmod(tmp_path, os.stat(path).st_mode)
+        os.replace(tmp_path, path)
+        stat = os.stat(path)
+        view = FileView(content, path, (stat.st_mtime_ns, stat.st_size))
+        self._views[path] = view
+        return view
+
+
+def _indent_width(line: str) -> int:
+    return len(line) - len(line.lstrip()) + line[:len(line) - len(line.lstrip())].count("\t") * 3
+
+
+def _realign(view: FileView, start: int, body: List[str]) -> Optional[List[str]]:
+    """Replacement lines for a hunk matched whitespace-insensitively at `start`.
+
+    Context lines are taken from the file as-is; added lines are shifted by the one
+    indentation offset between the hunk and the file. None if there isn't a single
+    consistent offset (then the match can't be trusted).
+    """
+    offsets = set()
+    uses_tabs = False
+    position = start
+    for line in body:
+        if line[:1] in (" ", "-"):
+            actual = view.lines[position]
+            if actual.strip():
+                offsets.add(_indent_width(actual) - _indent_width(line[1:]))
+                uses_tabs = uses_tabs or actual[:1] == "\t"
+            position += 1
+    if len(offsets) > 1:
+        return None
+    offset = offsets.pop() if offsets else 0
+
+    replacement = []
+    position = start
+    for line in body:
+        if line[:1] == " ":
+            replacement.append(view.lines[position])
+        elif line[:1] == "+":
+            text = line[1:]
+            if not text.strip():
+                replacement.append("")
+                continue
+            width = _indent_width(text) + offset
+            if width < 0:
+                return None
+            indent = "\t" * (width // 4) + " " * (width % 4) if uses_tabs else " " * width
+            replacement.append(indent + text.lstrip())
+        if line[:1] in (" ", "-"):
+            position += 1
+    return replacement
+
+
+def _locate_hunk(view: FileView, hunk: Hunk, hint: int, max_fuzz: int) -> Optional[Tuple[int, int, List[str]]]:
+    """(start, length, replacement) for a hunk, trying progressively looser matches"""
+    old = hunk.old_lines
+    lead = next((i for i, line in enumerate(hunk.lines) if line[:1] != " "), len(hunk.lines))
+    trail = next((i for i, line in enumerate(reversed(hunk.lines)) if line[:1] != " "), len(hunk.lines))
+
+    for fuzz in range(max_fuzz + 1):
+        # Like GNU patch: drop up to `fuzz` context lines from each end
+        cut_lead, cut_trail = min(fuzz, lead), min(fuzz, trail)
+        body = hunk.lines[cut_lead:len(hunk.lines) - cut_trail]
+        old_part = [line[1:] for line in body if line[:1] in (" ", "-")]
+        new_part = [line[1:] for line in body if line[:1] in (" ", "+")]
+        if not old_part and old:
+            continue
+        start = view.locate(old_part, hint + cut_lead, _norm_rstrip)
+        if start is not None:
+            return start, len(old_part), new_part
+        # Whitespace-insensitive: the model's indentation can't be trusted, re-derive it
+        start = view.locate(old_part, hint + cut_lead, _norm_strip)
+        if start is not None:
+            replacement = _realign(view, start, body)
+            if replacement is not None:
+                return start, len(old_part), replacement
+    return None
+
+
+def _reindent(code: str, indent: str) -> List[str]:
+    lines = code.split("\n")
+    body = [line for line in lines if line.strip()]
+    current = min((len(line) - len(line.lstrip()) for line in body), default=0)
+    return [indent + line[current:] if line.strip() else "" for line in lines]
+
+
+def apply_edits(view: FileView, hunks: List[Hunk], symbols: List[SymbolEdit], max_fuzz: int = 2) -> PatchResult:
+    """Apply hunks and symbol edits against a file view; failed edits are returned, not raised"""
+    spans: List[tuple] = []  # (start, length, replacement, edit)
+    failed_hunks: List[Hunk] = []
+    failed_symbols: List[SymbolEdit] = []
+
+    drift = 0  # how far earlier hunks landed from their stated line numbers
+    for hunk in hunks:
+        hint = (hunk.old_start - 1 if hunk.old_start else 0) + drift
+        found = _locate_hunk(view, hunk, hint, max_fuzz)
+        if found is None:
+            failed_hunks.append(hunk)
+            continue
+        spans.append(found + (hunk,))
+        if hunk.old_start:
+            drift = found[0] - (hunk.old_start - 1)
+
+    for edit in symbols:
+        span = view.symbols.get(edit.symbol)
+        if span is None:
+            failed_symbols.append(edit)
+            continue
+        start, end = span
+        original = view.lines[start]
+        indent = original[:len(original) - len(original.lstrip())]
+        spans.append((start, end - start, _reindent(edit.code, indent), edit))
+
+    # Apply bottom-up so earlier line numbers stay valid; skip overlapping edits
+    lines = list(view.lines)
+    applied = 0
+    floor = len(lines) + 1
+    for start, length, replacement, edit in sorted(spans, key=lambda s: s[0], reverse=True):
+        if start + length > floor:
+            (failed_hunks if isinstance(edit, Hunk) else failed_symbols).append(edit)
+            continue
+        lines[start:start + length] = replacement
+        floor = start
+        applied += 1
+
+    return PatchResult(
+        content="\n".join(lines),
+        applied=applied,
+        failed_hunks=failed_hunks,
+        failed_symbols=failed_symbols,
+    )
@@ -1,16 +1,79 @@
 import docker
+import io
 import tempfile
 import os
+import threading
+from typing import Dict, Optional
+
+import requests
+
+from core import tracing
+
+BASE_IMAGE = "python:3.11-slim"
+# Containers run with the network disabled, so pytest has to be baked into the image
+SANDBOX_IMAGE = "aurora-sandbox:py3.11-pytest"
+SANDBOX_DOCKERFILE = f"""FROM {BASE_IMAGE}
+RUN pip install --no-cache-dir pytest==8.3.2
+"""
+PYTEST_UNAVAILABLE = 97  # runner exit code (outside pytest's 0-5): suite imports pytest, image lacks it
+
+# Runs pytest (the sandbox image has it). The assert-only runner below is a last
+# resort for when that image could not be built, e.g. an offline Docker host.
+PYTEST_RUNNER = """
+import importlib, sys, traceback
+sys.path.insert(0, "/workspace")
+try:
+    import pytest
+except ImportError:
+    pytest = None
+if pytest is not None:
+    sys.exit(pytest.main(["-q", "-p", "no:cacheprovider", "/workspace/test_solution.py"]))
+try:
+    module = importlib.import_module("test_solution")
+except ModuleNotFoundError as e:
+    if e.name != "pytest":
+        raise
+    print("pytest is not installed in the sandbox image")
+    sys.exit(97)
+passed = failed = 0
+for name in sorted(dir(module)):
+    fn = getattr(module, name)
+    if name.startswith("test") and callable(fn):
+        try:
+            fn()
+            passed += 1
+        except Exception:
+            failed += 1
+            print("FAILED", name)
+            traceback.print_exc()
+print(f"{failed} failed, {passed} passed" if failed else f"{passed} passed")
+sys.exit(1 if failed or not passed else 0)
+"""
 
 class CodeSandbox:
-    def __init__(self):
+    def __init__(self, image: Optional[str] = None):
         self.client = docker.from_env()
-        # Pre-pull lightweight image
+        self.image = image or os.environ.get("AURORA_SANDBOX_IMAGE") or self._ensure_image()
+
+    def _ensure_image(self) -> str:
+        """The pytest-enabled sandbox image, built once; the bare slim image only as a fallback"""
+        try:
+            self.client.images.get(SANDBOX_IMAGE)
+            return SANDBOX_IMAGE
+        except Exception:
+            pass
         try:
-            self.client.images.get("python:3.11-slim")
+            print("Building sandbox image with pytest (one-time)...")
+            self.client.images.build(fileobj=io.BytesIO(SANDBOX_DOCKERFILE.encode()), tag=SANDBOX_IMAGE, rm=True)
+            return SANDBOX_IMAGE
+        except Exception as e:
+            print(f"⚠️ Could not build {SANDBOX_IMAGE} ({e}); falling back to {BASE_IMAGE} without pytest")
+        try:
+            self.client.images.get(BASE_IMAGE)
         except:
             print("Pulling sandbox image (one-time)...")
-            self.client.images.pull("python:3.11-slim")
+            self.client.images.pull(BASE_IMAGE)
+        return BASE_IMAGE
 
     def run(self, code: str, timeout: int = 30) -> Dict[str, str]:
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -20,7 +83,7 @@ class CodeSandbox:
             
             try:
                 container = self.client.containers.run(
-                    "python:3.11-slim",
+                    self.image,
                     command=["timeout", str(timeout), "python", "/script.py"],
                     volumes={tmpdir: {"bind": "/workspace", "mode": "rw"}},
                     working_dir="/workspace",
@@ -35,3 +98,50 @@ class CodeSandbox:
                 return {"stdout": stdout, "stderr": stderr, "exit_code": result["StatusCode"]}
             except Exception as e:
                 return {"stdout": "", "stderr": str(e), "exit_code": -1}
+
+    @tracing.traced("tool.run", tool="sandbox")
+    def run_files(
+        self,
+        files: Dict[str, str],
+        command: list,
+        timeout: int = 30,
+        cancel: Optional[threading.Event] = None,
+    ) -> Dict[str, str]:
+        """Write files into /workspace and run command; killed early if `cancel` is set"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for name, content in files.items():
+                with open(os.path.join(tmpdir, name), "w") as f:
+                    f.write(content)
+
+            try:
+                container = self.client.containers.run(
+                    self.image,
+                    command=["timeout", str(timeout)] + command,
+                    volumes={tmpdir: {"bind": "/workspace", "mode": "rw"}},
+                    working_dir="/workspace",
+                    mem_limit="512m",
+                    network_disabled=True,  # 🔒 No internet
+                    detach=True,
+                )
+                cancelled = False
+                while True:
+                    try:
+                        result = container.wait(timeout=0.5)
+                        break
+                    except (requests.exceptions.ReadTimeout, requests.exceptions.ConnectionError):
+                        if cancel is not None and cancel.is_set() and not cancelled:
+                            container.kill()
+                            cancelled = True
+                stdout = container.logs(stdout=True, stderr=False).decode()
+                stderr = container.logs(stdout=False, stderr=True).decode()
+                container.remove(force=True)
+                if cancelled:
+                    return {"stdout": stdout, "stderr": "cancelled", "exit_code": -2}
+                return {"stdout": stdout, "stderr": stderr, "exit_code": result["StatusCode"]}
+            except Exception as e:
+                return {"stdout": "", "stderr": str(e), "exit_code": -1}
+
+    def run_pytest(self, code: str, tests: str, timeout: int = 60, cancel: Optional[threading.Event] = None) -> Dict[str, str]:
+        """Run a generated test file against generated code (saved as solution.py)"""
+        files = {"solution.py": code, "test_solution.py": tests, "run_tests.py": PYTEST_RUNNER}
+        return self.run_files(files, ["python", "/workspace/run_tests.py"], timeout=timeout, cancel=cancel)
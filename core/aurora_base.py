@@ -14,6 +14,8 @@ from pydantic import BaseModel, Field
 from vllm import LLM, SamplingParams
 from transformers import AutoTokenizer
 
+from core import tracing
+
 
 class ToolCall(BaseModel):
     """Structured tool call output (mirroring OpenAI function_call schema)"""
@@ -29,38 +31,6 @@ class AuroraGenerationConfig(BaseModel):
     stream: bool = False
 
 
-class AuroraBase:
-    def __init__(
-        self,
-        model_id: str = "Qwen/Qwen2.5-7B-Instruct",
-        quantization: str = "awq",  # or "none", "gguf" (not implemented here)
-        max_model_len: int = 32768,
-        dtype: str = "auto",
-        gpu_memory_utilization: float = 0.9,
-        enforce_eager: bool = True,  # Avoid CUDA graphs on small GPUs
-        trust_remote_code: bool = True,
-    ):
-        self.model_id = model_id
-        self.quantization = quantization
-        self.max_model_len = max_model_len
-
-        # Auto-detect device
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        print(f"🔍 Detected device: {self.device.upper()}")
-
-        # Load tokenizer
-        self.tokenizer = AutoTokenizer.from_pretrained(
-            model_id,
-            trust_remote_code=trust_remote_code
-        )
-        if self.tokenizer.chat_template is None:
-            # Qwen2.5 has built-in chat template — but fallback if needed
-            self.tokenizer.chat_template = "{% for message in messages %}{{'<|im_start|>'
-
-
-from vllm import LLM, SamplingParams
-from transformers import AutoTokenizer
-
 class AuroraBase:
     def __init__(self, model_id: str, quantization: str = None, max_model_len: int = 32768):
         self.model_id = model_id
@@ -80,14 +50,34 @@ class AuroraBase:
             enforce_eager=True,  # Avoid CUDA graph issues on small GPUs
             **kwargs
         )
-        self.sampling_params = SamplingParams(
+        self.sampling_defaults = dict(
             temperature=0.3,
             top_p=0.9,
             max_tokens=2048
         )
+        self.sampling_params = SamplingParams(**self.sampling_defaults)
+
+    def _sampling(self, **overrides) -> SamplingParams:
+        """Fresh SamplingParams from the defaults plus overrides (vLLM's has no update())"""
+        return SamplingParams(**{**self.sampling_defaults, **overrides})
 
     def generate(self, prompt: str, **kwargs) -> str:
-        sampling = self.sampling_params.clone()
-        sampling.update(**kwargs)
-        outputs = self.llm.generate([prompt], sampling)
-        return outputs[0].outputs[0].text.strip()
+        with tracing.span("llm.generate", model=self.model_id) as span:
+            sampling = self._sampling(**kwargs)
+            outputs = self.llm.generate([prompt], sampling)
+            span.set(
+                prompt_tokens=len(outputs[0].prompt_token_ids or []),
+                completion_tokens=len(outputs[0].outputs[0].token_ids)
+            )
+            return outputs[0].outputs[0].text.strip()
+
+    def generate_n(self, prompt: str, n: int, **kwargs) -> List[str]:
+        """Sample n completions of one prompt in a single batched vLLM call (prefix is shared)"""
+        with tracing.span("llm.generate_n", model=self.model_id, n=n) as span:
+            sampling = self._sampling(n=n, **kwargs)
+            outputs = self.llm.generate([prompt], sampling)
+            span.set(
+                prompt_tokens=len(outputs[0].prompt_token_ids or []),
+                completion_tokens=sum(len(completion.token_ids) for completion in outputs[0].outputs)
+            )
+            return [completion.text.strip() for completion in outputs[0].outputs]
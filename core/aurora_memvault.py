@@ -1,19 +1,24 @@
+import json
 import faiss
 import sqlite3
 import numpy as np
 from sentence_transformers import SentenceTransformer
 from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from core import tracing
 
 class AuroraMemVault:
     def __init__(self, persist_dir: Path, embedding_model: str = "all-MiniLM-L6-v2"):
         self.persist_dir = persist_dir
         self.persist_dir.mkdir(exist_ok=True)
-        
+
         self.db_path = self.persist_dir / "memory.db"
         self.index_path = self.persist_dir / "faiss.index"
-        
+
         # Init SQLite
-        self.conn = sqlite3.connect(self.db_path)
+        # check_same_thread=False: MemVaultServer drives the vault from its batching thread
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
         self.conn.execute("""
             CREATE TABLE IF NOT EXISTS memories (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -23,28 +28,105 @@ class AuroraMemVault:
                 embedding BLOB
             )
         """)
-        
-        # Init FAISS
+
+        # Init FAISS (vector ids are SQLite row ids)
         self.encoder = SentenceTransformer(embedding_model)
         self.dim = self.encoder.get_sentence_embedding_dimension()
         if self.index_path.exists():
             self.index = faiss.read_index(str(self.index_path))
         else:
-            self.index = faiss.IndexFlatL2(self.dim)
-
-    def add_memory(self, key: str, content: str, meta dict = None):
-        embedding = self.encoder.encode([content])[0]
-        embedding_bytes = embedding.tobytes()
-        
-        self.conn.execute(
-            "INSERT OR REPLACE INTO memories (key, content, metadata, embedding) VALUES (?, ?, ?, ?)",
-            (key, content, json.dumps(metadata or {}), embedding_bytes)
-        )
-        self.conn.commit()
-        
-        # Update FAISS
-        if self.index.ntotal == 0:
-            self.index.add(np.array([embedding]))
-        else:
-            self.index.add(np.array([embedding]))
+            self.index = faiss.IndexIDMap2(faiss.IndexFlatL2(self.dim))
+        if not isinstance(self.index, faiss.IndexIDMap2):
+            # Older vaults used positional ids; rebuild keyed by row id
+            self._rebuild_index()
+
+    def _rebuild_index(self):
+        self.index = faiss.IndexIDMap2(faiss.IndexFlatL2(self.dim))
+        rows = self.conn.execute("SELECT id, embedding FROM memories").fetchall()
+        if rows:
+            ids = np.array([row[0] for row in rows], dtype=np.int64)
+            embeddings = np.stack([np.frombuffer(row[1], dtype=np.float32) for row in rows])
+            self.index.add_with_ids(embeddings, ids)
         faiss.write_index(self.index, str(self.index_path))
+
+    def add_memory(self, key: str, content: str, metadata: dict = None):
+        self.add_memories([{"key": key, "content": content, "metadata": metadata}])
+
+    @staticmethod
+    def memory_row(memory: Dict[str, Any]) -> Tuple[str, str, str]:
+        """(key, content, metadata JSON) for one memory; raises KeyError/TypeError if malformed"""
+        key, content, metadata = memory["key"], memory["content"], memory.get("metadata")
+        if not isinstance(key, str) or not isinstance(content, str):
+            raise TypeError("memory key and content must be strings")
+        if metadata is not None and not isinstance(metadata, dict):
+            raise TypeError("memory metadata must be an object")
+        return key, content, json.dumps(metadata or {})
+
+    @tracing.traced("memvault.add")
+    def add_memories(self, memories: List[Dict[str, Any]]):
+        """Insert/replace many memories with one encode call, one commit and one index write"""
+        # Validate + serialise everything first: a bad memory must not leave half a batch behind
+        rows = list({row[0]: row for row in map(self.memory_row, memories)}.values())  # last write per key wins
+        if not rows:
+            return
+        embeddings = self.encoder.encode([row[1] for row in rows]).astype(np.float32)
+
+        keys = [row[0] for row in rows]
+        try:
+            existing = self.conn.execute(
+                f"SELECT id FROM memories WHERE key IN ({','.join('?' * len(keys))})", keys
+            ).fetchall()
+            ids = []
+            for row, embedding in zip(rows, embeddings):
+                cursor = self.conn.execute(
+                    "INSERT OR REPLACE INTO memories (key, content, metadata, embedding) VALUES (?, ?, ?, ?)",
+                    (*row, embedding.tobytes())
+                )
+                ids.append(cursor.lastrowid)
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+
+        # Update FAISS only once the rows are durable; REPLACE deleted the old rows, so drop their vectors
+        if existing:
+            self.index.remove_ids(np.array([row[0] for row in existing], dtype=np.int64))
+        self.index.add_with_ids(embeddings, np.array(ids, dtype=np.int64))
+        faiss.write_index(self.index, str(self.index_path))
+
+    def search(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
+        """Top-k memories closest to the query (L2 distance, smaller is closer)"""
+        return self.search_batch([query], k)[0]
+
+    @tracing.traced("memvault.search")
+    def search_batch(self, queries: List[str], k: int = 5) -> List[List[Dict[str, Any]]]:
+        """search() for many queries with one encode call and one index search"""
+        if self.index.ntotal == 0 or not queries:
+            return [[] for _ in queries]
+        embeddings = self.encoder.encode(list(queries)).astype(np.float32)
+        distances, ids = self.index.search(embeddings, min(k, self.index.ntotal))
+
+        wanted = sorted({int(row_id) for row_id in ids.ravel() if row_id >= 0})
+        rows = {}
+        for start in range(0, len(wanted), 500):  # stay under SQLite's bound-parameter limit
+            chunk = wanted[start:start + 500]
+            rows.update(
+                (row[0], row[1:]) for row in self.conn.execute(
+                    f"SELECT id, key, content, metadata FROM memories WHERE id IN ({','.join('?' * len(chunk))})", chunk
+                )
+            )
+
+        results = []
+        for query_distances, query_ids in zip(distances, ids):
+            hits = []
+            for distance, row_id in zip(query_distances, query_ids):
+                row = rows.get(int(row_id))
+                if row:
+                    hits.append({
+                        "key": row[0],
+                        "content": row[1],
+                        "metadata": json.loads(row[2]),
+                        "distance": float(distance),
+                    })
+            results.append(hits)
+        return results
@@ -3,13 +3,44 @@
 AURORA-VLX: Multimodal Fusion Engine (Text + Image + Audio + Video)
 - Uses Qwen2-VL for image understanding
 - Whisper for audio transcription
-- InternVideo2 (placeholder) for video understanding
+- Keyframe-sampled video understanding: scene-change frames + parallel audio transcript
+- Dynamic batching for bursts of image requests (see core/vlx_batcher.py)
+- Per-image encoding cache so repeated questions skip re-encoding (see core/vlx_cache.py)
+- Models load lazily on first use, within RAM/VRAM budgets (see core/model_registry.py)
+- Long audio is streamed in VAD-split chunks with timestamped partial results (see core/vlx_audio.py)
+- Video frames are picked by streaming scene-change detection (see core/vlx_video.py)
 """
 
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
 import torch
-from PIL import Image
+from pydantic import BaseModel
 from transformers import AutoProcessor, AutoModelForCausalLM, pipeline
-from typing import Union, List, Dict, Any
+from typing import Union, List, Dict, Any, Iterator, Optional, Tuple
+
+import numpy as np
+
+from core import tracing
+from core.model_registry import ModelRegistry
+from core.vlx_audio import SAMPLE_RATE, NoAudioStream, TranscriptSegment, TranscriptMerger, audio_blocks, chunk_audio, prefetch
+from core.vlx_batcher import VisionBatcher, ImageInput, load_image
+from core.vlx_cache import VisionCache, EncodedImage, content_hash, perceptual_hash
+from core.vlx_video import select_keyframes
+
+
+DESCRIBE_QUESTION = "Describe this image in detail."
+OCR_QUESTION = "Extract all text from this image."
+UI_QUESTION = "List all interactive UI elements (buttons, inputs, links) and their positions."
+FRAME_QUESTION = "This is a frame from a video. Briefly describe what is happening."
+
+
+class VideoAnalysis(BaseModel):
+    """Structured output for video understanding"""
+    answer: str
+    keyframes: List[Dict[str, Any]] = []  # {"time", "score", "caption"}
+    transcript: List[TranscriptSegment] = []
 
 
 class AuroraVLX:
@@ -17,76 +48,368 @@ class AuroraVLX:
         self,
         vision_model_id: str = "Qwen/Qwen2-VL-2B-Instruct",
         audio_model_id: str = "openai/whisper-small",
-        device: str = "cuda" if torch.cuda.is_available() else "cpu"
+        device: str = "cuda" if torch.cuda.is_available() else "cpu",
+        max_batch_size: int = 8,
+        max_wait_ms: float = 20.0,
+        max_image_side: int = 1280,
+        max_new_tokens: int = 512,
+        cache_max_bytes: int = 512 * 1024 * 1024,
+        phash_distance: Optional[int] = None,  # e.g. 4 to reuse near-identical screenshots
+        cache_embeddings: bool = True,
+        ram_budget_gb: Optional[float] = None,
+        vram_budget_gb: Optional[float] = None,
+        idle_unload_s: Optional[float] = None,
     ):
         self.device = device
         self.vision_model_id = vision_model_id
         self.audio_model_id = audio_model_id
+        self.max_new_tokens = max_new_tokens
+        self.max_image_side = max_image_side
+        self.cache_embeddings = cache_embeddings
+        self.cache = VisionCache(max_bytes=cache_max_bytes, phash_distance=phash_distance)
 
-        print(f"🖼️ Loading AURORA-VLX: {vision_model_id} on {device.upper()}")
+        print(f"🖼️ Initializing AURORA-VLX on {device.upper()} (models load on first use)")
 
-        # Load vision model
-        self.processor = AutoProcessor.from_pretrained(vision_model_id)
-        self.model = AutoModelForCausalLM.from_pretrained(
-            vision_model_id,
-            torch_dtype=torch.float16 if device == "cuda" else torch.float32,
-            device_map="auto" if device == "cuda" else None
+        # Each modality's model is loaded on first use and may be unloaded when idle
+        self.models = ModelRegistry(
+            budgets={
+                "cpu": int(ram_budget_gb * 1e9) if ram_budget_gb else None,
+                "cuda": int(vram_budget_gb * 1e9) if vram_budget_gb else None,
+            },
+            idle_timeout_s=idle_unload_s,
         )
+        self.models.register("vision", self._load_vision_model, device=device)
+        self.models.register("whisper", self._load_whisper, device=device)
+
+        self._processor = None
+        self._processor_lock = threading.Lock()
 
-        # Load audio model (Whisper)
-        print(f"🎤 Loading Whisper: {audio_model_id}")
-        self.whisper_pipe = pipeline(
+        # Requests from concurrent callers are merged into batched generate calls
+        self.batcher = VisionBatcher(
+            self._generate_batch,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+            preprocess_fn=self.encode_image,
+        )
+
+    def _load_vision_model(self):
+        print(f"🖼️ Loading AURORA-VLX: {self.vision_model_id} on {self.device.upper()}")
+        return AutoModelForCausalLM.from_pretrained(
+            self.vision_model_id,
+            torch_dtype=torch.float16 if self.device == "cuda" else torch.float32,
+            device_map="auto" if self.device == "cuda" else None
+        )
+
+    def _load_whisper(self):
+        print(f"🎤 Loading Whisper: {self.audio_model_id}")
+        return pipeline(
             "automatic-speech-recognition",
-            model=audio_model_id,
-            device=device
+            model=self.audio_model_id,
+            device=self.device
+        )
+
+    @property
+    def processor(self):
+        """Vision processor (tokenizer + image preprocessing); light, so never unloaded"""
+        if self._processor is None:
+            with self._processor_lock:
+                if self._processor is None:
+                    processor = AutoProcessor.from_pretrained(self.vision_model_id)
+                    # Left padding so batched prompts all end where generation starts
+                    processor.tokenizer.padding_side = "left"
+                    self._processor = processor
+        return self._processor
+
+    @property
+    def model(self):
+        return self.models.get("vision")
+
+    @property
+    def whisper_pipe(self):
+        return self.models.get("whisper")
+
+    def memory_report(self) -> Dict[str, Any]:
+        """Resident models, load/unload event log with timings, and vision cache usage"""
+        return {
+            "models": self.models.stats(),
+            "events": list(self.models.events),
+            "vision_cache": self.cache.stats(),
+        }
+
+    def close(self) -> None:
+        """Stop the request batcher and the idle-model reaper"""
+        self.batcher.close()
+        self.models.close()
+
+    def encode_image(self, image: Union[ImageInput, EncodedImage]) -> EncodedImage:
+        """Decode + preprocess an image once; later calls on the same content hit the cache"""
+        if isinstance(image, EncodedImage):
+            return image
+
+        key = content_hash(image)
+        entry = self.cache.get(key)
+        if entry is not None:
+            return entry
+
+        pil_image = load_image(image, self.max_image_side)
+        phash = None
+        if self.cache.phash_distance is not None:
+            phash = perceptual_hash(pil_image)
+            entry = self.cache.get_similar(phash)
+            if entry is not None:
+                return entry
+
+        vision_inputs = self.processor.image_processor(images=[pil_image], return_tensors="pt")
+        grid_thw = vision_inputs["image_grid_thw"]
+        merge_length = self.processor.image_processor.merge_size ** 2
+        entry = EncodedImage(
+            key=key,
+            pixel_values=vision_inputs["pixel_values"],
+            image_grid_thw=grid_thw,
+            num_image_tokens=int(grid_thw.prod()) // merge_length,
+            phash=phash,
         )
+        return self.cache.put(entry)
+
+    def _can_reuse_embeds(self) -> bool:
+        """Only Qwen2-VL-style models expose a standalone vision tower we can call directly"""
+        return (
+            self.cache_embeddings
+            and hasattr(self.model, "visual")
+            and hasattr(self.model.config, "image_token_id")
+        )
+
+    def _image_embeds(self, entry: EncodedImage) -> torch.Tensor:
+        if entry.image_embeds is None:
+            visual = self.model.visual
+            pixel_values = entry.pixel_values.to(self.device, dtype=visual.get_dtype())
+            embeds = visual(pixel_values, grid_thw=entry.image_grid_thw.to(self.device))
+            self.cache.attach_embeds(entry, embeds)
+        return entry.image_embeds
+
+    def _prompt(self, question: str, num_image_tokens: int) -> str:
+        text = self.processor.apply_chat_template(
+            [{"role": "user", "content": [{"type": "image"}, {"type": "text", "text": question}]}],
+            tokenize=False,
+            add_generation_prompt=True
+        )
+        # Same expansion the processor does, without touching the pixels again
+        return text.replace("<|image_pad|>", "<|image_pad|>" * num_image_tokens, 1)
+
+    def _generate_batch(self, entries: List[EncodedImage], questions: List[str]) -> List[str]:
+        """Run one generate call over already-encoded images"""
+        texts = [self._prompt(question, entry.num_image_tokens) for entry, question in zip(entries, questions)]
+        inputs = self.processor.tokenizer(texts, padding=True, return_tensors="pt").to(self.device)
+        image_grid_thw = torch.cat([entry.image_grid_thw for entry in entries]).to(self.device)
+
+        span = tracing.span("vlx.generate_batch", batch_size=len(entries))
+        with span, self.models.use("vision"), torch.inference_mode():
+            if self._can_reuse_embeds():
+                # Feed cached vision-tower output straight into the token embeddings
+                image_embeds = torch.cat([self._image_embeds(entry) for entry in entries])
+                inputs_embeds = self.model.get_input_embeddings()(inputs["input_ids"])
+                image_mask = (inputs["input_ids"] == self.model.config.image_token_id).unsqueeze(-1).expand_as(inputs_embeds)
+                inputs_embeds = inputs_embeds.masked_scatter(image_mask, image_embeds.to(inputs_embeds.dtype))
+                vision_kwargs = {"inputs_embeds": inputs_embeds}
+            else:
+                pixel_values = torch.cat([entry.pixel_values for entry in entries]).to(self.device)
+                vision_kwargs = {"pixel_values": pixel_values}
+
+            generated_ids = self.model.generate(
+                **inputs,
+                **vision_kwargs,
+                image_grid_thw=image_grid_thw,
+                max_new_tokens=self.max_new_tokens
+            )
+
+            # Strip the (left-padded) prompt tokens
+            generated_ids = generated_ids[:, inputs["input_ids"].shape[1]:]
+            span.set(
+                prompt_tokens=int(inputs["attention_mask"].sum()),
+                completion_tokens=int((generated_ids != self.processor.tokenizer.pad_token_id).sum())
+            )
+        generated_texts = self.processor.batch_decode(generated_ids, skip_special_tokens=True)
+        return [text.strip() for text in generated_texts]
+
+    def describe_images(
+        self,
+        batch: List[Union[ImageInput, Tuple[ImageInput, str]]],
+        question: str = DESCRIBE_QUESTION
+    ) -> List[str]:
+        """Describe many images at once.
+
+        Items are image paths/PIL images (asked `question`) or (image, question) pairs.
+        Returns one answer per item, in input order; failures become error strings.
+        """
+        with tracing.span("vlx.describe_images", images=len(batch)):
+            requests = [item if isinstance(item, tuple) else (item, question) for item in batch]
+            futures = []
+            for image, q in requests:
+                try:
+                    futures.append(self.batcher.submit(image, q))
+                except Exception as e:  # e.g. the batcher was closed
+                    futures.append(Future())
+                    futures[-1].set_exception(e)
+
+            results = []
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append(f"❌ VLX Error: {str(e)}")
+            return results
 
     def describe_image(
         self,
         image_path: str,
-        question: str = "Describe this image in detail."
+        question: str = DESCRIBE_QUESTION
     ) -> str:
         """Generate text description of an image"""
+        return self.describe_images([(image_path, question)])[0]
+
+    def ask_image(self, image: ImageInput, questions: List[str]) -> List[str]:
+        """Answer several questions about one image, encoding it only once"""
         try:
-            image = Image.open(image_path).convert("RGB")
-            messages = [
-                {
-                    "role": "user",
-                    "content": [
-                        {"type": "image", "image": image},
-                        {"type": "text", "text": question}
-                    ]
-                }
-            ]
-
-            text = self.processor.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
-            image_inputs, video_inputs = self.processor.process_vision_info(messages)
-            inputs = self.processor(text=[text], images=image_inputs, videos=video_inputs, padding=True, return_tensors="pt").to(self.device)
-
-            generated_ids = self.model.generate(**inputs, max_new_tokens=512)
-            generated_texts = self.processor.batch_decode(generated_ids, skip_special_tokens=True)
-
-            return generated_texts[0].strip()
+            encoded = self.encode_image(image)
         except Exception as e:
-            return f"❌ VLX Error: {str(e)}"
+            return [f"❌ VLX Error: {str(e)}"] * len(questions)
+        return self.describe_images([(encoded, question) for question in questions])
+
+    def inspect_ui(self, image_path: str) -> Dict[str, str]:
+        """Description, OCR text and UI elements of a screenshot in one pass"""
+        description, text, ui_elements = self.ask_image(image_path, [DESCRIBE_QUESTION, OCR_QUESTION, UI_QUESTION])
+        return {"description": description, "text": text, "ui_elements": ui_elements}
+
+    def transcribe_audio_stream(
+        self,
+        audio: Union[str, np.ndarray],
+        batch_size: int = 4,
+        chunk_seconds: float = 30.0,
+        overlap_seconds: float = 2.0,
+    ) -> Iterator[TranscriptSegment]:
+        """Yield timestamped transcript segments as chunks finish.
+
+        `audio` is a file path (decoded as a stream) or a 16 kHz mono waveform.
+        Decoding + chunking runs ahead on a background thread while Whisper
+        works through batches of `batch_size` chunks; silent chunks are skipped.
+        """
+        chunks = chunk_audio(audio_blocks(audio), chunk_seconds, overlap_seconds)
+        merger = TranscriptMerger()
+
+        batch = []
+        for chunk in prefetch(chunks, maxsize=2 * batch_size):
+            if not chunk.has_speech:
+                continue
+            batch.append(chunk)
+            if len(batch) == batch_size:
+                yield from self._transcribe_batch(batch, merger)
+                batch = []
+        if batch:
+            yield from self._transcribe_batch(batch, merger)
+
+    def _transcribe_batch(self, batch: list, merger: TranscriptMerger) -> Iterator[TranscriptSegment]:
+        inputs = [{"raw": chunk.samples, "sampling_rate": SAMPLE_RATE} for chunk in batch]
+        audio_seconds = round(sum(chunk.duration for chunk in batch), 2)
+        with tracing.span("vlx.transcribe_batch", chunks=len(batch), audio_s=audio_seconds):
+            with self.models.use("whisper") as whisper_pipe:
+                results = whisper_pipe(inputs, batch_size=len(inputs), return_timestamps=True)
+        for chunk, result in zip(batch, results):
+            yield from merger.add(chunk, result)
 
     def transcribe_audio(self, audio_path: str) -> str:
         """Transcribe audio file using Whisper"""
         try:
-            result = self.whisper_pipe(audio_path, return_timestamps=False)
-            return result["text"]
+            return " ".join(segment.text for segment in self.transcribe_audio_stream(audio_path))
         except Exception as e:
             return f"❌ Whisper Error: {str(e)}"
 
+    def _generate_text(self, prompt: str) -> str:
+        """Text-only generation with the vision-language model"""
+        text = self.processor.apply_chat_template(
+            [{"role": "user", "content": [{"type": "text", "text": prompt}]}],
+            tokenize=False,
+            add_generation_prompt=True
+        )
+        inputs = self.processor.tokenizer([text], return_tensors="pt").to(self.device)
+        with self.models.use("vision") as model, torch.inference_mode():
+            generated_ids = model.generate(**inputs, max_new_tokens=self.max_new_tokens)
+        generated_ids = generated_ids[:, inputs["input_ids"].shape[1]:]
+        return self.processor.batch_decode(generated_ids, skip_special_tokens=True)[0].strip()
+
+    def _video_transcript(self, video_path: str) -> List[TranscriptSegment]:
+        try:
+            return list(self.transcribe_audio_stream(video_path))
+        except NoAudioStream:
+            return []
+
+    @tracing.traced("vlx.analyze_video")
+    def analyze_video_detailed(
+        self,
+        video_path: str,
+        question: str = "Describe the key events in this video.",
+        max_frames: int = 16,
+        scene_threshold: float = 0.12,
+        sample_fps: float = 2.0,
+        transcribe: bool = True,
+        codec_keyframes_only: Optional[bool] = None,
+    ) -> VideoAnalysis:
+        """Keyframes + captions + transcript, then one answer over all of it.
+
+        The audio track is transcribed on a separate thread while frames are
+        decoded and scored; only the <= max_frames selected frames reach the
+        (batched) vision model. codec_keyframes_only=None decodes only codec
+        keyframes for long videos (see vlx_video.LONG_VIDEO_S); pass True/False to force.
+        """
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="vlx-video-audio") as pool:
+            transcript_future = (
+                pool.submit(contextvars.copy_context().run, self._video_transcript, video_path)
+                if transcribe else None
+            )
+
+            keyframes = select_keyframes(
+                video_path,
+                max_frames=max_frames,
+                threshold=scene_threshold,
+                sample_fps=sample_fps,
+                max_side=self.max_image_side,
+                codec_keyframes_only=codec_keyframes_only,
+            )
+            print(f"🎥 Selected {len(keyframes)} keyframes from {video_path}")
+            captions = self.describe_images([(frame.image, FRAME_QUESTION) for frame in keyframes])
+
+            transcript = transcript_future.result() if transcript_future else []
+
+        frame_notes = "\n".join(f"[{frame.time:.1f}s] {caption}" for frame, caption in zip(keyframes, captions))
+        transcript_notes = "\n".join(f"[{seg.start:.1f}s] {seg.text}" for seg in transcript)
+        prompt = f"""You are analyzing a video using its keyframe descriptions and audio transcript.
+Keyframes:
+{frame_notes or "(none)"}
+
+Transcript:
+{transcript_notes or "(no speech)"}
+
+Question: {question}"""
+
+        return VideoAnalysis(
+            answer=self._generate_text(prompt),
+            keyframes=[
+                {"time": frame.time, "score": frame.score, "caption": caption}
+                for frame, caption in zip(keyframes, captions)
+            ],
+            transcript=transcript,
+        )
+
     def analyze_video(self, video_path: str, question: str = "Describe the key events in this video.") -> str:
-        """Placeholder for video understanding (InternVideo2)"""
-        # In real implementation, use InternVideo2 or similar
-        return f"🎥 Video analysis not implemented yet. Placeholder for {video_path}. Question: {question}"
+        """Answer a question about a video from its keyframes and audio track"""
+        try:
+            return self.analyze_video_detailed(video_path, question).answer
+        except Exception as e:
+            return f"❌ VLX Error: {str(e)}"
 
     def ocr_image(self, image_path: str) -> str:
         """Extract text from image (OCR)"""
-        return self.describe_image(image_path, "Extract all text from this image.")
+        return self.describe_image(image_path, OCR_QUESTION)
 
     def detect_ui_elements(self, image_path: str) -> str:
         """Detect buttons, inputs, etc. in UI screenshot"""
-        return self.describe_image(image_path, "List all interactive UI elements (buttons, inputs, links) and their positions.")
+        return self.describe_image(image_path, UI_QUESTION)
@@ -0,0 +1,333 @@
+# core/memvault_service.py
+"""
+AURORA-MemVault Service: One shared vault for many agent replicas
+- MemVaultServer owns the AuroraMemVault (SQLite + FAISS) and serves it over HTTP/JSON
+- Concurrent requests are batched: requests that queue while a batch runs form the next one,
+  one encode + one FAISS call per batch of searches, one commit + one index write per batch of adds
+- MemVaultClient mirrors add_memory/search, keeping a small LRU + TTL read cache
+- connect_memvault() picks the client when AURORA_MEMVAULT_URL is set, else a local vault
+
+Usage (from the repo root):
+    python -m core.memvault_service --persist-dir ./aurora_memory --port 7000
+    AURORA_MEMVAULT_URL=http://127.0.0.1:7000 python demo.py
+"""
+
+import argparse
+import http.client
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from core import tracing
+from core.aurora_memvault import AuroraMemVault
+
+
+class MemVaultServer:
+    """HTTP front for a single AuroraMemVault; all vault access happens on one batching thread.
+
+    Endpoints (JSON): POST /search {"query" | "queries", "k"}, POST /add {"key", "content",
+    "metadata"} or {"memories": [...]}, GET /health, GET /metrics (Prometheus).
+    """
+
+    def __init__(
+        self,
+        vault: AuroraMemVault,
+        host: str = "127.0.0.1",
+        port: int = 7000,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 0.0,
+    ):
+        self.vault = vault
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._worker = threading.Thread(target=self._loop, name="memvault-batcher", daemon=True)
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._serve_thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MemVaultServer":
+        """Serve in background threads (returns immediately)"""
+        self._worker.start()
+        self._serve_thread = threading.Thread(target=self._httpd.serve_forever, name="memvault-http", daemon=True)
+        self._serve_thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._worker.start()
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self._serve_thread is not None:
+            self._httpd.shutdown()
+            self._serve_thread = None
+        self._httpd.server_close()
+        if self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join()
+
+    # -------------------------------------------------------- batching
+
+    def submit(self, op: str, payload: Any) -> Future:
+        """Queue one "search" ((query, k)) or "add" (list of memory dicts, committed all-or-nothing) request"""
+        future: Future = Future()
+        self._queue.put((op, payload, future, time.perf_counter()))
+        return future
+
+    def _collect(self) -> Optional[list]:
+        first = self._queue.get()
+        if first is None:
+            return None
+
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                # Past the deadline, still take whatever queued up while the last batch ran
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Flush what we have, then stop on the next loop
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _loop(self) -> None:
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            self._run(batch)
+
+    def _run(self, batch: list) -> None:
+        started = time.perf_counter()
+        for *_, submitted in batch:
+            tracing.observe_queue_wait("memvault", started - submitted)
+
+        # Concurrent requests have no ordering between them, so apply writes first:
+        # a client that waited for its add always sees it in later searches.
+        adds = [item for item in batch if item[0] == "add"]
+        searches = [item for item in batch if item[0] == "search"]
+        with tracing.span("memvault.batch", adds=len(adds), searches=len(searches)):
+            if adds:
+                # Each add payload is one request's memory list; a failed batch is retried per request
+                self._resolve(adds, lambda payloads: self.vault.add_memories([m for ms in payloads for m in ms]), each=False)
+            by_k: Dict[int, list] = {}
+            for item in searches:
+                by_k.setdefault(item[1][1], []).append(item)
+            for k, items in by_k.items():
+                self._resolve(items, lambda payloads, k=k: self.vault.search_batch([p[0] for p in payloads], k))
+
+    @classmethod
+    def _resolve(cls, items: list, fn, each: bool = True) -> None:
+        """Run fn over the batch's payloads; if it fails, retry requests one by one to isolate the bad ones"""
+        try:
+            results = fn([payload for _, payload, _, _ in items])
+        except Exception as e:
+            if len(items) > 1:
+                for item in items:
+                    cls._resolve([item], fn, each)
+                return
+            for _, _, future, _ in items:
+                future.set_exception(e)
+            return
+        for i, (_, _, future, _) in enumerate(items):
+            future.set_result(results[i] if each else None)
+
+    # -------------------------------------------------------- HTTP
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive: clients reuse one connection per thread
+            disable_nagle_algorithm = True  # headers and body are separate writes
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, content_type: str = "application/json") -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _json(self, status: int, data: Any) -> None:
+                self._send(status, json.dumps(data).encode())
+
+            def do_GET(self):
+                if self.path == "/health":
+                    self._json(200, {"status": "ok", "memories": int(server.vault.index.ntotal)})
+                elif self.path == "/metrics":
+                    self._send(200, tracing.render_prometheus().encode(), "text/plain; version=0.0.4")
+                else:
+                    self._json(404, {"error": f"Unknown path: {self.path}"})
+
+            def do_POST(self):
+                try:
+                    data = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                    if self.path == "/search":
+                        k = int(data.get("k", 5))
+                        if k < 1:
+                            raise ValueError("k must be >= 1")
+                        queries = data["queries"] if "queries" in data else [data["query"]]
+                        if not isinstance(queries, list) or not all(isinstance(q, str) for q in queries):
+                            raise TypeError("queries must be a list of strings")
+                        futures = [server.submit("search", (q, k)) for q in queries]
+                        results = [f.result() for f in futures]
+                        self._json(200, {"results": results if "queries" in data else results[0]})
+                    elif self.path == "/add":
+                        memories = data["memories"] if "memories" in data else [data]
+                        if not isinstance(memories, list):
+                            raise TypeError("memories must be a list")
+                        for memory in memories:
+                            AuroraMemVault.memory_row(memory)  # reject malformed memories before queueing any
+                        # One queue item per request: its memories commit together or not at all
+                        server.submit("add", memories).result()
+                        self._json(200, {"added": len(memories)})
+                    else:
+                        self._json(404, {"error": f"Unknown path: {self.path}"})
+                except (KeyError, ValueError, TypeError) as e:
+                    self._json(400, {"error": f"Bad request: {e}"})
+                except Exception as e:
+                    self._json(500, {"error": str(e)})
+
+        return Handler
+
+
+class MemVaultClient:
+    """Drop-in for AuroraMemVault.add_memory/search that talks to a MemVaultServer.
+
+    Searches are cached locally (LRU, `cache_ttl_s` old at most); this client's own adds
+    clear the cache, other replicas' adds become visible once entries expire.
+    """
+
+    def __init__(self, url: str, cache_size: int = 1024, cache_ttl_s: float = 30.0, timeout: float = 30.0):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 80
+        self.timeout = timeout
+        self.cache_size = cache_size
+        self.cache_ttl_s = cache_ttl_s
+
+        self._cache: "OrderedDict[Tuple[str, int], Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _request(self, method: str, path: str, data: Any = None) -> Any:
+        body = json.dumps(data).encode() if data is not None else None
+        for attempt in (0, 1):
+            conn = getattr(self._local, "conn", None)
+            if conn is None:
+                conn = self._local.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                conn.request(method, path, body=body, headers={"Content-Type": "application/json"})
+                response = conn.getresponse()
+                payload = json.loads(response.read() or b"{}")
+            except (http.client.HTTPException, ConnectionError):
+                # Stale keep-alive connection (server restarted); reconnect once
+                conn.close()
+                self._local.conn = None
+                if attempt:
+                    raise
+                continue
+            if response.status != 200:
+                raise RuntimeError(f"MemVault {path} failed ({response.status}): {payload.get('error')}")
+            return payload
+
+    def add_memory(self, key: str, content: str, metadata: dict = None):
+        self.add_memories([{"key": key, "content": content, "metadata": metadata}])
+
+    def add_memories(self, memories: List[Dict[str, Any]]):
+        self._request("POST", "/add", {"memories": memories})
+        with self._lock:
+            self._cache.clear()
+
+    def search(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
+        return self.search_batch([query], k)[0]
+
+    def search_batch(self, queries: List[str], k: int = 5) -> List[List[Dict[str, Any]]]:
+        now = time.monotonic()
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        with self._lock:
+            for query in queries:
+                entry = self._cache.get((query, k))
+                if entry is not None and now - entry[0] <= self.cache_ttl_s:
+                    self._cache.move_to_end((query, k))
+                    results[query] = entry[1]
+        for query in queries:
+            tracing.record_cache("memvault.client", query in results)
+
+        missing = list(dict.fromkeys(q for q in queries if q not in results))
+        if missing:
+            fetched = self._request("POST", "/search", {"queries": missing, "k": k})["results"]
+            with self._lock:
+                for query, hits in zip(missing, fetched):
+                    results[query] = hits
+                    if self.cache_size > 0:
+                        self._cache[(query, k)] = (now, hits)
+                        self._cache.move_to_end((query, k))
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return [results[query] for query in queries]
+
+    def health(self) -> Dict[str, Any]:
+        return self._request("GET", "/health")
+
+
+def connect_memvault(persist_dir: Path, embedding_model: str = "all-MiniLM-L6-v2", url: Optional[str] = None):
+    """MemVaultClient if a service URL is given (or AURORA_MEMVAULT_URL is set), else a local AuroraMemVault"""
+    url = url or os.environ.get("AURORA_MEMVAULT_URL")
+    if url:
+        return MemVaultClient(
+            url,
+            cache_size=int(os.environ.get("AURORA_MEMVAULT_CACHE_SIZE", "1024")),
+            cache_ttl_s=float(os.environ.get("AURORA_MEMVAULT_CACHE_TTL", "30")),
+        )
+    return AuroraMemVault(persist_dir=persist_dir, embedding_model=embedding_model)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serve one AURORA-MemVault to many replicas")
+    parser.add_argument("--persist-dir", default=os.environ.get("AURORA_MEMVAULT_DIR", "./aurora_memory"))
+    parser.add_argument("--embedding-model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=7000)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=0.0,
+                        help="extra time to hold a batch open; 0 batches whatever queued during the last batch")
+    args = parser.parse_args(argv)
+
+    if os.environ.get("AURORA_TRACING", "1").lower() not in ("0", "false", "no"):
+        tracing.enable()
+    vault = AuroraMemVault(persist_dir=Path(args.persist_dir), embedding_model=args.embedding_model)
+    server = MemVaultServer(vault, args.host, args.port, args.max_batch_size, args.max_wait_ms)
+    print(f"🧠 MemVault service on {server.url} ({args.persist_dir})")
+    server.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+# core/model_registry.py
+"""
+AURORA Model Registry: Lazy, memory-budgeted model loading
+- Models are registered with a loader and only loaded on first use
+- Loaded sizes are tracked against per-device (RAM / VRAM) budgets
+- Least-recently-used idle models are unloaded to make room
+- Loaders run outside the registry lock: a slow load only blocks callers of that model
+- With idle_timeout_s, a daemon reaper unloads models nobody has used in that long
+- Every load / unload is recorded with timings in an event log
+"""
+
+import gc
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import torch
+
+from core import tracing
+
+
+def device_kind(device: str) -> str:
+    """Budget bucket for a device string: 'cuda' for any GPU, else 'cpu'"""
+    return "cuda" if str(device).startswith("cuda") else "cpu"
+
+
+def model_nbytes(obj: Any) -> int:
+    """Parameter + buffer bytes of a torch module, HF pipeline, or tuple of them"""
+    if isinstance(obj, (tuple, list)):
+        return sum(model_nbytes(item) for item in obj)
+    module = getattr(obj, "model", obj)  # HF pipelines wrap the module in .model
+    if not isinstance(module, torch.nn.Module):
+        return 0
+    tensors = list(module.parameters()) + list(module.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
+class _ModelSlot:
+    def __init__(self, name: str, loader: Callable[[], Any], device: str, size_hint: int):
+        self.name = name
+        self.loader = loader
+        self.device = device_kind(device)
+        self.size_hint = size_hint
+        self.obj: Any = None
+        self.nbytes = 0
+        self.loading: Optional[threading.Event] = None  # set while a loader runs, outside the lock
+        self.reserved = 0  # budget bytes held for an in-flight load
+        self.in_use = 0
+        self.last_used = 0.0
+        self.load_count = 0
+        self.load_seconds = 0.0
+
+
+class ModelRegistry:
+    """Loads models on demand and keeps the resident set within memory budgets.
+
+    budgets maps 'cpu' / 'cuda' to a byte limit; a missing entry means unlimited.
+    Models pinned via `use()` are never evicted. A model whose size is still unknown
+    (no size_hint, never loaded) is assumed to need the whole budget, so every idle
+    model on its device is unloaded before it loads.
+    """
+
+    def __init__(
+        self,
+        budgets: Optional[Dict[str, int]] = None,
+        idle_timeout_s: Optional[float] = None,
+        max_events: int = 1000,
+    ):
+        self.budgets = {k: v for k, v in (budgets or {}).items() if v is not None}
+        self.idle_timeout_s = idle_timeout_s
+        self.events: deque = deque(maxlen=max_events)
+        self._slots: Dict[str, _ModelSlot] = {}
+        self._lock = threading.RLock()
+
+        self._stop = threading.Event()
+        self._reaper: Optional[threading.Thread] = None
+        if idle_timeout_s is not None:
+            self._reaper = threading.Thread(target=self._reap, name="model-reaper", daemon=True)
+            self._reaper.start()
+
+    def _reap(self) -> None:
+        # Idle models are also checked on every get(); this covers deployments that go quiet
+        interval = min(max(self.idle_timeout_s / 2, 0.05), 30.0)
+        while not self._stop.wait(interval):
+            self.unload_idle()
+
+    def close(self) -> None:
+        """Stop the idle reaper (loaded models stay loaded)"""
+        self._stop.set()
+        if self._reaper is not None:
+            self._reaper.join()
+            self._reaper = None
+
+    def register(self, name: str, loader: Callable[[], Any], device: str = "cpu", size_hint: int = 0) -> None:
+        """Declare a model; nothing is loaded until get()/use()"""
+        with self._lock:
+            self._slots[name] = _ModelSlot(name, loader, device, size_hint)
+
+    def is_loaded(self, name: str) -> bool:
+        return self._slots[name].obj is not None
+
+    def get(self, name: str) -> Any:
+        """Return the model, loading it (and evicting others) if needed"""
+        return self._acquire(name, pin=False)
+
+    @contextmanager
+    def use(self, name: str) -> Iterator[Any]:
+        """Pin a model for the duration of a call so it can't be evicted mid-inference"""
+        obj = self._acquire(name, pin=True)
+        try:
+            yield obj
+        finally:
+            with self._lock:
+                slot = self._slots[name]
+                slot.in_use -= 1
+                slot.last_used = time.monotonic()
+
+    def unload(self, name: str, reason: str = "manual") -> bool:
+        with self._lock:
+            slot = self._slots[name]
+            if slot.obj is None or slot.in_use:
+                return False
+            started = time.perf_counter()
+            freed = slot.nbytes
+            slot.obj = None
+            slot.nbytes = 0
+            gc.collect()
+            if slot.device == "cuda" and torch.cuda.is_available():
+                torch.cuda.empty_cache()
+            self._log("unload", slot, nbytes=freed, seconds=time.perf_counter() - started, reason=reason)
+            print(f"♻️ Unloaded {name} ({freed / 1e9:.2f} GB, {reason})")
+            return True
+
+    def unload_idle(self, keep: Optional[str] = None) -> List[str]:
+        """Unload models unused for longer than idle_timeout_s (except `keep`)"""
+        if self.idle_timeout_s is None:
+            return []
+        with self._lock:
+            now = time.monotonic()
+            expired = [
+                slot.name for slot in self._slots.values()
+                if slot.name != keep and slot.obj is not None and not slot.in_use
+                and now - slot.last_used > self.idle_timeout_s
+            ]
+            return [name for name in expired if self.unload(name, reason="idle")]
+
+    def resident_bytes(self, device: str) -> int:
+        """Loaded bytes on a device, plus the budget reserved by loads in flight"""
+        kind = device_kind(device)
+        return sum(
+            (s.nbytes if s.obj is not None else s.reserved) for s in self._slots.values() if s.device == kind
+        )
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                name: {
+                    "loaded": slot.obj is not None,
+                    "device": slot.device,
+                    "bytes": slot.nbytes,
+                    "in_use": slot.in_use,
+                    "load_count": slot.load_count,
+                    "load_seconds": round(slot.load_seconds, 3),
+                }
+                for name, slot in self._slots.items()
+            }
+
+    def _acquire(self, name: str, pin: bool) -> Any:
+        while True:
+            with self._lock:
+                slot = self._slots[name]
+                self.unload_idle(keep=name)
+                if slot.obj is not None:
+                    slot.last_used = time.monotonic()
+                    if pin:
+                        slot.in_use += 1
+                    return slot.obj
+                loading = slot.loading
+                if loading is None:
+                    loading = slot.loading = threading.Event()
+                    self._reserve(slot)
+                    break
+            # Another thread is loading this model: wait for it, then re-check
+            # (it may have failed, or been evicted again already)
+            loading.wait()
+
+        try:
+            print(f"📦 Loading {slot.name} on {slot.device.upper()}")
+            started = time.perf_counter()
+            with tracing.span("model.load", model=slot.name):
+                obj = slot.loader()
+            elapsed = time.perf_counter() - started
+            nbytes = model_nbytes(obj)
+        except BaseException:
+            with self._lock:
+                slot.reserved = 0
+                slot.loading = None
+            loading.set()
+            raise
+
+        with self._lock:
+            slot.obj = obj
+            slot.nbytes = nbytes
+            slot.size_hint = nbytes or slot.size_hint
+            slot.reserved = 0
+            slot.loading = None
+            slot.load_count += 1
+            slot.load_seconds += elapsed
+            slot.last_used = time.monotonic()
+            if pin:
+                slot.in_use += 1
+            self._log("load", slot, nbytes=nbytes, seconds=elapsed)
+            self._make_room(slot, 0)
+        loading.set()
+        return obj
+
+    def _reserve(self, slot: _ModelSlot) -> None:
+        # Make room up front using the best size we know and hold it while the loader runs;
+        # the real size is re-checked once it is published.
+        # Unknown size: assume the worst, otherwise two big models end up resident together.
+        expected = slot.size_hint or slot.nbytes
+        budget = self.budgets.get(slot.device)
+        if not expected and budget is not None:
+            expected = budget
+        self._make_room(slot, expected)
+        slot.reserved = expected
+
+    def _make_room(self, slot: _ModelSlot, incoming: int) -> None:
+        """Unload idle LRU models on slot's device until `incoming` more bytes fit the budget"""
+        budget = self.budgets.get(slot.device)
+        if budget is None:
+            return
+
+        candidates = sorted(
+            (s for s in self._slots.values() if s is not slot and s.obj is not None and s.device == slot.device and not s.in_use),
+            key=lambda s: s.last_used,
+        )
+        for victim in candidates:
+            if self.resident_bytes(slot.device) + incoming <= budget:
+                return
+            self.unload(victim.name, reason=f"budget:{slot.name}")
+
+        if self.resident_bytes(slot.device) + incoming > budget:
+            self._log("over_budget", slot, nbytes=self.resident_bytes(slot.device) + incoming, seconds=0.0)
+
+    def _log(self, event: str, slot: _ModelSlot, nbytes: int, seconds: float, reason: str = "") -> None:
+        self.events.append({
+            "event": event,
+            "model": slot.name,
+            "device": slot.device,
+            "bytes": nbytes,
+            "seconds": round(seconds, 4),
+            "reason": reason,
+            "time": time.time(),
+        })
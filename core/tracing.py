@@ -0,0 +1,288 @@
+# core/tracing.py
+"""
+AURORA Tracing: Lightweight spans + metrics for the hot paths
+- `span()` / `@traced` time LLM generate, tool runs, MemVault, VLX and model loads
+- Span attributes carry prompt/completion tokens; queue wait and cache hits are recorded as metrics directly
+- Metrics render in Prometheus text format (served on /metrics by the API server)
+- `chrome_trace()` records spans into a Chrome trace JSON (chrome://tracing, Perfetto); recording is
+  scoped to the calling context, worker threads join via `current_recorders()` / `record_into()`
+- Disabled by default (AURORA_TRACING=1 enables): a disabled span is a shared no-op
+"""
+
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+LABEL_ATTRS = ("tool", "model", "cache", "queue")  # low-cardinality attrs promoted to metric labels
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+    def set(self, **attrs) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    __slots__ = ("tracer", "name", "attrs", "start_ns", "duration_ns", "thread_id")
+
+    def __init__(self, tracer: "Tracer", name: str, attrs: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.start_ns = 0
+        self.duration_ns = 0
+        self.thread_id = 0
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> "Span":
+        self.thread_id = threading.get_ident()
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.duration_ns = time.perf_counter_ns() - self.start_ns
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.tracer._finish(self)
+
+
+class Metrics:
+    """Thread-safe counters + histograms with Prometheus text rendering"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Tuple], float] = {}
+        self._histograms: Dict[Tuple[str, Tuple], List[float]] = {}  # bucket counts..., sum, count
+        self._help: Dict[str, Tuple[str, str]] = {}
+
+    def inc(self, metric: str, value: float = 1.0, description: str = "", **labels) -> None:
+        key = (metric, tuple(sorted(labels.items())))
+        with self._lock:
+            self._help.setdefault(metric, ("counter", description))
+            self._counters[key] = self._counters.get(key, 0.0) + value
+
+    def observe(self, metric: str, value: float, description: str = "", **labels) -> None:
+        key = (metric, tuple(sorted(labels.items())))
+        with self._lock:
+            self._help.setdefault(metric, ("histogram", description))
+            series = self._histograms.get(key)
+            if series is None:
+                series = self._histograms[key] = [0.0] * (len(DURATION_BUCKETS) + 2)
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    @staticmethod
+    def _labels(pairs: Tuple, extra: Tuple = ()) -> str:
+        items = list(pairs) + list(extra)
+        if not items:
+            return ""
+        escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in items)
+        return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(items, escaped)) + "}"
+
+    def render(self) -> str:
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items())
+            helps = dict(self._help)
+
+        lines = []
+        described = set()
+
+        def header(metric: str) -> None:
+            if metric not in described:
+                kind, text = helps[metric]
+                lines.append(f"# HELP {metric} {text or metric}")
+                lines.append(f"# TYPE {metric} {kind}")
+                described.add(metric)
+
+        for (metric, labels), value in counters:
+            header(metric)
+            lines.append(f"{metric}{self._labels(labels)} {value:g}")
+        for (metric, labels), series in histograms:
+            header(metric)
+            for bound, count in zip(DURATION_BUCKETS, series):
+                lines.append(f"{metric}_bucket{self._labels(labels, (('le', f'{bound:g}'),))} {count:g}")
+            lines.append(f"{metric}_bucket{self._labels(labels, (('le', '+Inf'),))} {series[-1]:g}")
+            lines.append(f"{metric}_sum{self._labels(labels)} {series[-2]:.6f}")
+            lines.append(f"{metric}_count{self._labels(labels)} {series[-1]:g}")
+        return "\n".join(lines) + "\n"
+
+
+class Tracer:
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.metrics = Metrics()
+        self._recorders: "contextvars.ContextVar[Tuple[List[Span], ...]]" = contextvars.ContextVar(
+            f"aurora_trace_recorders_{id(self)}", default=()
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        return self.enabled or bool(self._recorders.get())
+
+    def span(self, name: str, **attrs):
+        if not (self.enabled or self._recorders.get()):
+            return NOOP_SPAN
+        return Span(self, name, attrs)
+
+    def record_cache(self, cache: str, hit: bool) -> None:
+        if self.enabled:
+            self.metrics.inc(
+                "aurora_cache_requests_total", description="Cache lookups by result",
+                cache=cache, result="hit" if hit else "miss"
+            )
+
+    def observe_queue_wait(self, queue: str, seconds: float) -> None:
+        if self.enabled:
+            self.metrics.observe("aurora_queue_wait_seconds", seconds, description="Time requests wait before processing", queue=queue)
+
+    def _finish(self, span: Span) -> None:
+        recorders = self._recorders.get()
+        if recorders:
+            with self._lock:
+                for recorder in recorders:
+                    recorder.append(span)
+        if not self.enabled:
+            return
+
+        attrs = span.attrs
+        labels = {"span": span.name}
+        labels.update((k, attrs[k]) for k in LABEL_ATTRS if k in attrs)
+        self.metrics.observe("aurora_span_duration_seconds", span.duration_ns / 1e9, description="Span wall time", **labels)
+        if "error" in attrs:
+            self.metrics.inc("aurora_span_errors_total", description="Spans that raised", **labels)
+        if "prompt_tokens" in attrs:
+            self.metrics.inc("aurora_tokens_total", attrs["prompt_tokens"], description="Tokens processed", type="prompt", **labels)
+        if "completion_tokens" in attrs:
+            self.metrics.inc("aurora_tokens_total", attrs["completion_tokens"], description="Tokens processed", type="completion", **labels)
+
+    def current_recorders(self) -> Tuple[List[Span], ...]:
+        """Recorders of the calling context, to hand to record_into() on a worker thread"""
+        return self._recorders.get()
+
+    @contextmanager
+    def record_into(self, recorders: Iterable[List[Span]]) -> Iterator[None]:
+        """Also record spans finished in this context into `recorders`"""
+        current = self._recorders.get()
+        added = tuple(r for r in recorders if not any(r is c for c in current))
+        token = self._recorders.set(current + added)
+        try:
+            yield
+        finally:
+            self._recorders.reset(token)
+
+    @contextmanager
+    def chrome_trace(self, path: Optional[str] = None) -> Iterator[List[Span]]:
+        """Record spans finished in this context while active; write Chrome trace JSON to path.
+
+        Only the calling thread (and contexts copied from it) records: other threads' spans
+        stay out unless they join via current_recorders() / record_into().
+        """
+        recorder: List[Span] = []
+        try:
+            with self.record_into((recorder,)):
+                yield recorder
+        finally:
+            if path:
+                write_chrome_trace(recorder, path)
+
+
+def write_chrome_trace(spans: List[Span], path: str) -> None:
+    pid = os.getpid()
+    events = [
+        {
+            "name": span.name,
+            "cat": span.name.split(".", 1)[0],
+            "ph": "X",
+            "ts": span.start_ns / 1000.0,
+            "dur": span.duration_ns / 1000.0,
+            "pid": pid,
+            "tid": span.thread_id,
+            "args": {k: v if isinstance(v, (int, float, str, bool)) else str(v) for k, v in span.attrs.items()},
+        }
+        for span in spans
+    ]
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+# Process-wide default tracer
+TRACER = Tracer(enabled=os.environ.get("AURORA_TRACING", "0").lower() not in ("0", "", "false", "no"))
+
+
+def enable() -> None:
+    TRACER.enabled = True
+
+
+def disable() -> None:
+    TRACER.enabled = False
+
+
+def span(name: str, **attrs):
+    return TRACER.span(name, **attrs)
+
+
+def traced(name: str, **static_attrs) -> Callable:
+    """Decorator form of span(); costs one attribute check per call while disabled"""
+    def decorate(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not TRACER.active:
+                return fn(*args, **kwargs)
+            with Span(TRACER, name, dict(static_attrs)):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    TRACER.record_cache(cache, hit)
+
+
+def observe_queue_wait(queue: str, seconds: float) -> None:
+    TRACER.observe_queue_wait(queue, seconds)
+
+
+def chrome_trace(path: Optional[str] = None):
+    return TRACER.chrome_trace(path)
+
+
+def current_recorders() -> Tuple[List[Span], ...]:
+    return TRACER.current_recorders()
+
+
+def record_into(recorders: Iterable[List[Span]]):
+    return TRACER.record_into(recorders)
+
+
+def render_prometheus() -> str:
+    return TRACER.metrics.render()
@@ -0,0 +1,283 @@
+# core/vlx_audio.py
+"""
+AURORA-VLX Audio: Streaming long-audio chunking for Whisper
+- Decodes audio as a stream of mono float32 blocks (PyAV), or slices a NumPy array
+- Splits into ~30 s chunks at voice-activity gaps; hard cuts get an overlap instead
+- Skips chunks with no detected speech
+- Merges per-chunk timestamped segments back into one de-duplicated transcript
+"""
+
+import contextvars
+import queue
+import re
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+from pydantic import BaseModel
+
+
+SAMPLE_RATE = 16000  # Whisper's native rate
+
+
+class NoAudioStream(Exception):
+    """The media file has no audio stream to decode"""
+
+
+class TranscriptSegment(BaseModel):
+    """One piece of transcript with absolute timestamps (seconds)"""
+    start: float
+    end: float
+    text: str
+
+
+class AudioChunk:
+    """A window of audio plus the span of it whose transcript we keep.
+
+    Chunks cut at silence keep everything; chunks cut mid-speech overlap their
+    neighbour and each side keeps only its half of the overlap.
+    """
+
+    def __init__(self, samples: np.ndarray, start: float, keep_from: float, keep_until: float, has_speech: bool):
+        self.samples = samples
+        self.start = start
+        self.keep_from = keep_from
+        self.keep_until = keep_until
+        self.has_speech = has_speech
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / SAMPLE_RATE
+
+
+def array_blocks(samples: np.ndarray, block_seconds: float = 5.0) -> Iterator[np.ndarray]:
+    """Yield an in-memory waveform in blocks (handy for synthetic audio in tests)"""
+    samples = np.asarray(samples, dtype=np.float32).reshape(-1)
+    block = int(block_seconds * SAMPLE_RATE)
+    for offset in range(0, len(samples), block):
+        yield samples[offset:offset + block]
+
+
+def decode_audio_blocks(path: str, block_seconds: float = 5.0, stream_index: int = 0) -> Iterator[np.ndarray]:
+    """Decode any ffmpeg-readable audio (or a video's audio track) as 16 kHz mono blocks"""
+    try:
+        import av
+    except ImportError:
+        raise ImportError("Streaming audio decoding requires PyAV: pip install av")
+
+    block = int(block_seconds * SAMPLE_RATE)
+    resampler = av.AudioResampler(format="flt", layout="mono", rate=SAMPLE_RATE)
+    pending: List[np.ndarray] = []
+    pending_len = 0
+
+    with av.open(path) as container:
+        if stream_index >= len(container.streams.audio):
+            raise NoAudioStream(f"{path} has no audio stream #{stream_index}")
+        stream = container.streams.audio[stream_index]
+        frames = container.decode(stream)
+        for frame in _with_flush(frames):
+            for resampled in resampler.resample(frame):
+                data = resampled.to_ndarray().reshape(-1)
+                pending.append(data)
+                pending_len += len(data)
+                if pending_len >= block:
+                    yield np.concatenate(pending)
+                    pending, pending_len = [], 0
+
+    if pending:
+        yield np.concatenate(pending)
+
+
+def _with_flush(frames: Iterable[Any]) -> Iterator[Any]:
+    yield from frames
+    yield None  # flushes the resampler
+
+
+def audio_blocks(source: Union[str, np.ndarray], block_seconds: float = 5.0) -> Iterator[np.ndarray]:
+    if isinstance(source, np.ndarray):
+        return array_blocks(source, block_seconds)
+    return decode_audio_blocks(source, block_seconds)
+
+
+def frame_rms(samples: np.ndarray, frame_len: int) -> np.ndarray:
+    """RMS energy of consecutive non-overlapping frames"""
+    n_frames = len(samples) // frame_len
+    if n_frames == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = samples[:n_frames * frame_len].reshape(n_frames, frame_len)
+    return np.sqrt(np.mean(frames * frames, axis=1))
+
+
+def speech_mask(rms: np.ndarray, floor: float = 1e-3, ratio: float = 3.0) -> np.ndarray:
+    """Energy VAD: a frame is speech if well above the noise floor.
+
+    The threshold is capped at 10% of the loudest frame so that audio with no
+    pauses at all (noise floor == speech level) still counts as speech.
+    """
+    if len(rms) == 0:
+        return np.zeros(0, dtype=bool)
+    noise = float(np.percentile(rms, 10))
+    threshold = max(floor, min(noise * ratio, 0.1 * float(rms.max())))
+    return rms > threshold
+
+
+def find_silence_split(
+    samples: np.ndarray,
+    min_offset: int,
+    frame_ms: float = 30.0,
+    min_silence_ms: float = 300.0,
+) -> Optional[int]:
+    """Sample index at the centre of the latest long-enough silence after min_offset"""
+    frame_len = int(SAMPLE_RATE * frame_ms / 1000)
+    speech = speech_mask(frame_rms(samples, frame_len))
+    if len(speech) == 0:
+        return None
+
+    # Run-length encode the silence mask
+    silent = np.concatenate([[False], ~speech, [False]])
+    edges = np.flatnonzero(np.diff(silent.astype(np.int8)))
+    starts, ends = edges[0::2], edges[1::2]
+
+    min_frames = max(1, int(min_silence_ms / frame_ms))
+    best = None
+    for start, end in zip(starts, ends):
+        center = (start + end) // 2 * frame_len
+        if end - start >= min_frames and center >= min_offset:
+            best = center
+    return best
+
+
+def chunk_audio(
+    blocks: Iterable[np.ndarray],
+    chunk_seconds: float = 30.0,
+    overlap_seconds: float = 2.0,
+    min_chunk_seconds: float = 10.0,
+) -> Iterator[AudioChunk]:
+    """Re-cut a stream of blocks into Whisper-sized chunks; holds at most ~one chunk in memory"""
+    chunk_len = int(chunk_seconds * SAMPLE_RATE)
+    overlap_len = int(overlap_seconds * SAMPLE_RATE)
+    min_len = int(min_chunk_seconds * SAMPLE_RATE)
+
+    buffer = np.zeros(0, dtype=np.float32)
+    buffer_start = 0.0
+    keep_from = 0.0
+
+    for block in blocks:
+        buffer = np.concatenate([buffer, np.asarray(block, dtype=np.float32)])
+        while len(buffer) >= chunk_len:
+            window = buffer[:chunk_len]
+            split = find_silence_split(window, min_offset=min_len)
+            if split is not None:
+                cut, next_start = split, split
+                keep_until = buffer_start + cut / SAMPLE_RATE
+            else:
+                cut, next_start = chunk_len, chunk_len - overlap_len
+                keep_until = buffer_start + (cut - overlap_len / 2) / SAMPLE_RATE
+
+            samples = buffer[:cut].copy()
+            yield AudioChunk(samples, buffer_start, keep_from, keep_until, _has_speech(samples))
+
+            keep_from = keep_until
+            buffer = buffer[next_start:]
+            buffer_start += next_start / SAMPLE_RATE
+
+    if len(buffer):
+        yield AudioChunk(buffer, buffer_start, keep_from, float("inf"), _has_speech(buffer))
+
+
+def _has_speech(samples: np.ndarray, frame_ms: float = 30.0) -> bool:
+    """Whole-chunk silence check: does speech_mask() find any speech frame?
+
+    Relative to the chunk's own levels (with speech_mask's 1e-3 floor), so quiet
+    recordings are still transcribed.
+    """
+    return bool(speech_mask(frame_rms(samples, int(SAMPLE_RATE * frame_ms / 1000))).any())
+
+
+def prefetch(items: Iterable[Any], maxsize: int) -> Iterator[Any]:
+    """Produce items on a background thread so decoding overlaps with inference.
+
+    The bounded queue caps how far ahead the producer can run.
+    """
+    q: "queue.Queue" = queue.Queue(maxsize=maxsize)
+    done = object()
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put(item):
+                    return
+        except Exception as e:
+            put(e)
+        finally:
+            put(done)
+
+    threading.Thread(target=contextvars.copy_context().run, args=(produce,), name="vlx-audio-decode", daemon=True).start()
+    try:
+        while True:
+            item = q.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+_WORD_RE = re.compile(r"[^\w']+")
+
+
+def _norm(word: str) -> str:
+    return _WORD_RE.sub("", word.lower())
+
+
+class TranscriptMerger:
+    """Turns per-chunk Whisper outputs into absolute, non-overlapping segments"""
+
+    def __init__(self, max_dedup_words: int = 8):
+        self.max_dedup_words = max_dedup_words
+        self._tail: List[str] = []  # last words emitted, for junction de-duplication
+
+    def add(self, chunk: AudioChunk, result: Dict[str, Any]) -> List[TranscriptSegment]:
+        pieces = result.get("chunks") or [{"timestamp": (0.0, chunk.duration), "text": result.get("text", "")}]
+
+        segments = []
+        # Only hard cuts overlap their predecessor; after a silence cut a repeated word is real speech
+        at_junction = chunk.keep_from > chunk.start
+        for piece in pieces:
+            start, end = piece.get("timestamp") or (0.0, None)
+            start = chunk.start + (start or 0.0)
+            end = chunk.start + (end if end is not None else chunk.duration)
+            middle = (start + end) / 2
+            if not (chunk.keep_from <= middle < chunk.keep_until):
+                continue
+            text = self._append(piece.get("text", "").strip(), dedup=at_junction)
+            at_junction = False
+            if text:
+                segments.append(TranscriptSegment(start=round(start, 3), end=round(end, 3), text=text))
+        return segments
+
+    def _append(self, text: str, dedup: bool) -> str:
+        """Record emitted words; at a chunk junction, first drop words repeating the previous tail"""
+        words = text.split()
+        if dedup:
+            tail = [_norm(w) for w in self._tail]
+            head = [_norm(w) for w in words]
+            for k in range(min(self.max_dedup_words, len(tail), len(head)), 0, -1):
+                if tail[-k:] == head[:k]:
+                    words = words[k:]
+                    break
+        if words:
+            self._tail = (self._tail + words)[-self.max_dedup_words:]
+        return " ".join(words)
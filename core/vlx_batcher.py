@@ -0,0 +1,145 @@
+# core/vlx_batcher.py
+"""
+AURORA-VLX Batcher: Dynamic batching for vision requests
+- Collects concurrent (image, question) requests into one generate call
+- Flushes on max_batch_size or after max_wait_ms, whichever comes first
+- Decodes + resizes images in a thread pool, overlapping with generation
+- Resolves each caller's Future with its own answer
+- Spans from a batch reach the trace recorders of every caller in it
+"""
+
+import contextvars
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Union
+
+from PIL import Image
+
+from core import tracing
+
+
+ImageInput = Union[str, Image.Image]
+
+
+def load_image(image: ImageInput, max_side: Optional[int] = 1280) -> Image.Image:
+    """Open an image (path or PIL) as RGB, downscaling so the longest side <= max_side"""
+    img = image if isinstance(image, Image.Image) else Image.open(image)
+    img = img.convert("RGB")
+    if max_side and max(img.size) > max_side:
+        img.thumbnail((max_side, max_side), Image.BICUBIC)
+    return img
+
+
+class VisionBatcher:
+    """Background worker that turns single vision requests into batched generate calls.
+
+    `generate_fn(images, questions)` must return one answer per (image, question) pair,
+    in order. It always runs on the batcher's worker thread.
+    """
+
+    def __init__(
+        self,
+        generate_fn: Callable[[List[Any], List[str]], List[str]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 20.0,
+        max_image_side: Optional[int] = 1280,
+        decode_workers: int = 4,
+        preprocess_fn: Optional[Callable[[ImageInput], Any]] = None,
+    ):
+        self.generate_fn = generate_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_image_side = max_image_side
+        self.preprocess_fn = preprocess_fn or (lambda image: load_image(image, self.max_image_side))
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._decoder = ThreadPoolExecutor(max_workers=decode_workers, thread_name_prefix="vlx-decode")
+        self._closed = False
+        self._worker = threading.Thread(target=self._loop, name="vlx-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, image: ImageInput, question: str) -> Future:
+        """Queue one request; decoding starts immediately in the thread pool"""
+        if self._closed:
+            raise RuntimeError("VisionBatcher is closed")
+        future: Future = Future()
+        decoded = self._decoder.submit(contextvars.copy_context().run, self.preprocess_fn, image)
+        self._queue.put((decoded, question, future, time.perf_counter(), tracing.current_recorders()))
+        return future
+
+    def close(self) -> None:
+        """Drain pending requests and stop the worker"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._worker.join()
+        self._decoder.shutdown(wait=True)
+
+    def _collect(self) -> Optional[list]:
+        first = self._queue.get()
+        if first is None:
+            return None
+
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                # Flush what we have, then stop on the next loop
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _loop(self) -> None:
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            self._run(batch)
+
+    def _run(self, batch: list) -> None:
+        images, questions, futures, recorders = [], [], [], []
+        started = time.perf_counter()
+        for decoded, question, future, submitted, callers_recorders in batch:
+            if not future.set_running_or_notify_cancel():
+                continue
+            recorders.extend(callers_recorders)
+            tracing.observe_queue_wait("vlx.vision", started - submitted)
+            try:
+                images.append(decoded.result())
+            except Exception as e:
+                future.set_exception(e)
+                continue
+            questions.append(question)
+            futures.append(future)
+
+        if not futures:
+            return
+
+        try:
+            with tracing.record_into(recorders):
+                answers = self.generate_fn(images, questions)
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+
+        answers = list(answers)
+        if len(answers) != len(futures):
+            error = RuntimeError(f"generate_fn returned {len(answers)} answers for {len(futures)} requests")
+            for future in futures:
+                future.set_exception(error)
+            return
+
+        for future, answer in zip(futures, answers):
+            future.set_result(answer)
@@ -0,0 +1,154 @@
+# core/vlx_cache.py
+"""
+AURORA-VLX Cache: Per-image encoding cache
+- Keyed by image content hash (SHA-256 of the file / pixel bytes)
+- Optional perceptual hash (dHash) to reuse near-identical screenshots
+- Stores preprocessed vision inputs and, when available, vision-tower embeddings
+- Memory-bounded LRU eviction
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from PIL import Image
+
+from core import tracing
+
+
+def content_hash(image: Any) -> str:
+    """SHA-256 of an image file's bytes, or of a PIL image's raw pixels"""
+    h = hashlib.sha256()
+    if isinstance(image, Image.Image):
+        h.update(f"{image.mode}:{image.size}".encode())
+        h.update(image.tobytes())
+    else:
+        with open(image, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+def perceptual_hash(image: Image.Image, hash_size: int = 8) -> int:
+    """64-bit difference hash (dHash): robust to cursor blinks, tiny re-renders, recompression"""
+    small = image.convert("L").resize((hash_size + 1, hash_size), Image.BILINEAR)
+    pixels = list(small.getdata())
+    bits = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return bits
+
+
+def tensor_nbytes(value: Any) -> int:
+    """Best-effort size of a tensor / array (0 for anything else)"""
+    if value is None:
+        return 0
+    if hasattr(value, "element_size") and hasattr(value, "nelement"):
+        return value.element_size() * value.nelement()
+    return getattr(value, "nbytes", 0)
+
+
+class EncodedImage:
+    """Everything the vision path needs to answer questions about one image"""
+
+    def __init__(self, key: str, pixel_values: Any, image_grid_thw: Any, num_image_tokens: int, phash: Optional[int] = None):
+        self.key = key
+        self.pixel_values = pixel_values
+        self.image_grid_thw = image_grid_thw
+        self.num_image_tokens = num_image_tokens
+        self.phash = phash
+        self.image_embeds: Any = None  # filled lazily by the vision tower
+
+    @property
+    def nbytes(self) -> int:
+        return tensor_nbytes(self.pixel_values) + tensor_nbytes(self.image_grid_thw) + tensor_nbytes(self.image_embeds)
+
+
+class VisionCache:
+    """Thread-safe LRU of EncodedImage entries, bounded by total bytes"""
+
+    def __init__(self, max_bytes: int = 512 * 1024 * 1024, phash_distance: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self.phash_distance = phash_distance  # None disables perceptual matching
+        self._entries: "OrderedDict[str, EncodedImage]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[EncodedImage]:
+        with self._lock:
+            entry = self._entries.get(key)
+            tracing.record_cache("vlx.vision", entry is not None)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def get_similar(self, phash: int) -> Optional[EncodedImage]:
+        """Closest entry within phash_distance bits, if perceptual matching is enabled"""
+        if self.phash_distance is None:
+            return None
+        with self._lock:
+            best, best_distance = None, self.phash_distance + 1
+            for entry in self._entries.values():
+                if entry.phash is None:
+                    continue
+                distance = bin(entry.phash ^ phash).count("1")
+                if distance < best_distance:
+                    best, best_distance = entry, distance
+            if best is None:
+                return None
+            self._entries.move_to_end(best.key)
+            self.near_hits += 1
+            tracing.record_cache("vlx.vision.phash", True)
+            # The earlier exact-key lookup already counted this as a miss
+            self.misses -= 1
+            return best
+
+    def put(self, entry: EncodedImage) -> EncodedImage:
+        with self._lock:
+            existing = self._entries.get(entry.key)
+            if existing is not None:
+                self._entries.move_to_end(entry.key)
+                return existing
+            self._entries[entry.key] = entry
+            self._bytes += entry.nbytes
+            self._evict()
+            return entry
+
+    def attach_embeds(self, entry: EncodedImage, image_embeds: Any) -> None:
+        """Store vision-tower output on an entry and account for its size"""
+        with self._lock:
+            entry.image_embeds = image_embeds
+            if entry.key not in self._entries:
+                return
+            self._bytes += tensor_nbytes(image_embeds)
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "near_hits": self.near_hits,
+                "misses": self.misses,
+            }
@@ -25,7 +25,7 @@ except ImportError:
 
 from core.aurora_base import AuroraBase
 from core.aurora_vlx import AuroraVLX
-from core.aurora_memvault import AuroraMemVault
+from core.memvault_service import connect_memvault
 from agents.executive_agent import ExecutiveAgent
 from coder.aurora_coder import AuroraCoder
 from agents.tools.shell_tool import ShellTool
@@ -51,8 +51,9 @@ def main():
     )
 
     # 3️⃣ Long-Context & Memory — AURORA-MemVault™
+    # Set AURORA_MEMVAULT_URL to share one vault across replicas (python -m core.memvault_service)
     print("🔹 Initializing AURORA-MemVault™ (FAISS + SQLite)...")
-    memvault = AuroraMemVault(
+    memvault = connect_memvault(
         persist_dir=Path("./aurora_memory"),
         embedding_model="sentence-transformers/all-MiniLM-L6-v2"
     )
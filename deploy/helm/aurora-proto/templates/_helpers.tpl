@@ -0,0 +1,35 @@
+{{- define "aurora-proto.name" -}}
+{{- default .Chart.Name .Values.nameOverride | trunc 63 | trimSuffix "-" }}
+{{- end }}
+
+{{- define "aurora-proto.fullname" -}}
+{{- if .Values.fullnameOverride }}
+{{- .Values.fullnameOverride | trunc 63 | trimSuffix "-" }}
+{{- else if contains (include "aurora-proto.name" .) .Release.Name }}
+{{- .Release.Name | trunc 63 | trimSuffix "-" }}
+{{- else }}
+{{- printf "%s-%s" .Release.Name (include "aurora-proto.name" .) | trunc 63 | trimSuffix "-" }}
+{{- end }}
+{{- end }}
+
+{{- define "aurora-proto.labels" -}}
+helm.sh/chart: {{ printf "%s-%s" .Chart.Name .Chart.Version | replace "+" "_" }}
+{{ include "aurora-proto.selectorLabels" . }}
+app.kubernetes.io/version: {{ .Chart.AppVersion | quote }}
+app.kubernetes.io/managed-by: {{ .Release.Service }}
+{{- end }}
+
+{{- define "aurora-proto.selectorLabels" -}}
+app.kubernetes.io/name: {{ include "aurora-proto.name" . }}
+app.kubernetes.io/instance: {{ .Release.Name }}
+{{- end }}
+
+{{/* The shared MemVault service: one StatefulSet pod owns the vault, agent replicas are clients */}}
+{{- define "aurora-proto.memvaultName" -}}
+{{- printf "%s-memvault" (include "aurora-proto.fullname" .) | trunc 63 | trimSuffix "-" }}
+{{- end }}
+
+{{- define "aurora-proto.memvaultSelectorLabels" -}}
+app.kubernetes.io/name: {{ include "aurora-proto.name" . }}-memvault
+app.kubernetes.io/instance: {{ .Release.Name }}
+{{- end }}
@@ -1 +1,514 @@
+# forge/distill.py
+"""
+AURORA-Forge Distill: Streaming dataset builder from MemVault agent traces
+- Reads memories from SQLite in id-ordered batches (keyset pagination, read-only)
+- Keeps goal/step traces by outcome (metadata "success" written by ExecutiveAgent)
+- Drops near-duplicates: SimHash over the stored embeddings, or MinHash over text shingles
+- Tokenizes prompt/completion pairs into length-bucketed shards: a flat token .bin plus an
+  .idx.npy of (start, length, prompt_len) rows, both np.memmap-able
+- Memory is bounded by batch size, shard size and the dedup window, never by corpus size
+- Parallel builds split the row-id range across processes (or machines, via --partition;
+  pin --id-range so every machine splits the same range, merge checks all N parts agree)
 
+Usage (from the repo root):
+    python -m forge.distill --memvault ./aurora_memory --out ./forge_data --workers 4
+    python -m forge.distill --memvault ./aurora_memory --out ./forge_data --partition 3/8 --id-range 0:250000
+    python -m forge.distill --out ./forge_data --merge
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import zlib
+from array import array
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+
+
+FORMAT = "aurora-forge-shards/1"
+MERSENNE_31 = (1 << 31) - 1
+
+
+class DistillConfig(BaseModel):
+    tokenizer: str = "Qwen/Qwen2.5-7B-Instruct"
+    outcome: str = "success"  # "success" | "failure" | "any"
+    dedup: str = "embedding"  # "embedding" (SimHash) | "minhash" | "none"
+    similarity: float = 0.9  # fraction of matching signature positions that counts as a duplicate
+    dedup_window: int = 100_000  # most recent kept signatures remembered (~1 KB each)
+    buckets: List[int] = [512, 1024, 2048, 4096, 8192]  # max tokens per length bucket
+    shard_tokens: int = 1 << 24  # roll a bucket's shard after this many tokens
+    batch_size: int = 512
+    seed: int = 0
+
+
+# ---------------------------------------------------------------- reading
+
+def iter_memories(db_path: Path, start_id: int = 0, end_id: Optional[int] = None,
+                  batch_size: int = 512) -> Iterator[List[Tuple]]:
+    """Yield batches of (id, content, metadata, embedding) rows with start_id < id <= end_id"""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        last = start_id
+        limit = end_id if end_id is not None else (1 << 62)
+        while True:
+            rows = conn.execute(
+                "SELECT id, content, metadata, embedding FROM memories WHERE id > ? AND id <= ? ORDER BY id LIMIT ?",
+                (last, limit, batch_size)
+            ).fetchall()
+            if not rows:
+                return
+            yield rows
+            last = rows[-1][0]
+    finally:
+        conn.close()
+
+
+def id_range(db_path: Path) -> Tuple[int, int]:
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        lo, hi = conn.execute("SELECT MIN(id), MAX(id) FROM memories").fetchone()
+    finally:
+        conn.close()
+    return (lo - 1, hi) if lo is not None else (0, 0)
+
+
+def split_id_range(lo: int, hi: int, parts: int) -> List[Tuple[int, int]]:
+    """Split (lo, hi] into `parts` contiguous half-open id ranges"""
+    bounds = np.linspace(lo, hi, parts + 1).round().astype(np.int64)
+    return [(int(bounds[i]), int(bounds[i + 1])) for i in range(parts)]
+
+
+def trace_example(content: str, metadata: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    """(prompt, completion) for one ExecutiveAgent step memory, or None if it is not a trace"""
+    goal = metadata.get("goal")
+    if not goal:
+        return None
+    step = metadata.get("step", "")
+    output = content[len(step) + 1:] if step and content.startswith(step + "\n") else content
+    tool = metadata.get("tool") or "none"
+    prompt = f"Goal: {goal}\nStep: {step}"
+    completion = output if tool == "none" else f"Tool: {tool}\nResult: {output}"
+    return prompt, completion
+
+
+def keep_outcome(metadata: Dict[str, Any], outcome: str) -> bool:
+    if outcome == "any":
+        return True
+    success = metadata.get("success")
+    if success is None:
+        return False
+    return bool(success) == (outcome == "success")
+
+
+# ---------------------------------------------------------------- near-duplicate detection
+
+class SimHasher:
+    """Random-hyperplane signatures: matching-bit fraction ~ 1 - angle/pi between embeddings"""
+
+    def __init__(self, dim: int, bits: int = 64, seed: int = 0):
+        self.planes = np.random.default_rng(seed).standard_normal((dim, bits)).astype(np.float32)
+
+    def __call__(self, embeddings: np.ndarray) -> np.ndarray:
+        return (embeddings @ self.planes > 0).astype(np.uint8)
+
+
+class MinHasher:
+    """MinHash over word n-gram shingles: matching-slot fraction ~ Jaccard similarity"""
+
+    def __init__(self, num_perm: int = 64, ngram: int = 5, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, MERSENNE_31, num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, MERSENNE_31, num_perm, dtype=np.uint64)
+        self.ngram = ngram
+
+    def __call__(self, texts: List[str]) -> np.ndarray:
+        signatures = np.empty((len(texts), len(self.a)), dtype=np.uint32)
+        for row, text in enumerate(texts):
+            words = text.split() or [""]
+            shingles = {" ".join(words[i:i + self.ngram]) for i in range(max(1, len(words) - self.ngram + 1))}
+            hashes = np.fromiter((zlib.crc32(s.encode()) for s in shingles), dtype=np.uint64, count=len(shingles))
+            # crc32 < 2^32 and a < 2^31, so the product fits in uint64
+            signatures[row] = ((np.outer(hashes, self.a) + self.b) % MERSENNE_31).min(axis=0)
+        return signatures
+
+
+class NearDuplicateIndex:
+    """LSH (banded signatures) over the most recent `capacity` kept items"""
+
+    def __init__(self, bands: int, similarity: float, capacity: int):
+        self.bands = bands
+        self.similarity = similarity
+        self.capacity = max(1, capacity)
+        self._buckets: Dict[bytes, List[int]] = {}
+        self._items: "OrderedDict[int, Tuple[np.ndarray, List[bytes]]]" = OrderedDict()
+        self._next_id = 0
+
+    def _keys(self, signature: np.ndarray) -> List[bytes]:
+        return [bytes([i]) + band.tobytes() for i, band in enumerate(np.split(signature, self.bands))]
+
+    def add_if_new(self, signature: np.ndarray) -> bool:
+        """Remember the signature and return True, unless it near-duplicates one already kept"""
+        keys = self._keys(signature)
+        seen = set()
+        for key in keys:
+            for item_id in self._buckets.get(key, ()):
+                if item_id in seen:
+                    continue
+                seen.add(item_id)
+                if np.mean(self._items[item_id][0] == signature) >= self.similarity:
+                    return False
+
+        item_id = self._next_id
+        self._next_id += 1
+        self._items[item_id] = (signature, keys)
+        for key in keys:
+            self._buckets.setdefault(key, []).append(item_id)
+        if len(self._items) > self.capacity:
+            self._forget_oldest()
+        return True
+
+    def _forget_oldest(self) -> None:
+        item_id, (_, keys) = self._items.popitem(last=False)
+        for key in keys:
+            bucket = self._buckets[key]
+            bucket.remove(item_id)
+            if not bucket:
+                del self._buckets[key]
+
+
+# ---------------------------------------------------------------- shard writing
+
+def token_dtype(tokenizer) -> np.dtype:
+    vocab = len(tokenizer) if hasattr(tokenizer, "__len__") else getattr(tokenizer, "vocab_size", None)
+    return np.dtype(np.uint16) if vocab and vocab <= 65535 else np.dtype(np.uint32)
+
+
+class ShardWriter:
+    """Appends token sequences to <name>.bin; the (start, length, prompt_len) index is saved on close"""
+
+    def __init__(self, out_dir: Path, name: str, dtype: np.dtype):
+        self.out_dir = out_dir
+        self.name = name
+        self.dtype = dtype
+        self.tokens = 0
+        self._file = open(out_dir / f"{name}.bin", "wb")
+        self._index = array("q")
+
+    def add(self, ids: np.ndarray, prompt_len: int) -> None:
+        ids.astype(self.dtype, copy=False).tofile(self._file)
+        self._index.extend((self.tokens, len(ids), prompt_len))
+        self.tokens += len(ids)
+
+    def close(self) -> Dict[str, Any]:
+        self._file.close()
+        index = np.frombuffer(self._index, dtype=np.int64).reshape(-1, 3)
+        np.save(self.out_dir / f"{self.name}.idx.npy", index)
+        return {"bin": f"{self.name}.bin", "index": f"{self.name}.idx.npy",
+                "sequences": len(index), "tokens": self.tokens}
+
+
+class BucketedShards:
+    """One open ShardWriter per length bucket, rolled every `shard_tokens` tokens"""
+
+    def __init__(self, out_dir: Path, prefix: str, buckets: List[int], shard_tokens: int, dtype: np.dtype):
+        self.out_dir = out_dir
+        self.prefix = prefix
+        self.buckets = sorted(buckets)
+        self.shard_tokens = shard_tokens
+        self.dtype = dtype
+        self.shards: List[Dict[str, Any]] = []
+        self._open: Dict[int, ShardWriter] = {}
+        self._counts: Counter = Counter()
+
+    def bucket_for(self, length: int) -> Optional[int]:
+        for bucket in self.buckets:
+            if length <= bucket:
+                return bucket
+        return None
+
+    def add(self, ids: np.ndarray, prompt_len: int, bucket: int) -> None:
+        writer = self._open.get(bucket)
+        if writer is None:
+            name = f"{self.prefix}-b{bucket}-{self._counts[bucket]:05d}"
+            writer = self._open[bucket] = ShardWriter(self.out_dir, name, self.dtype)
+            self._counts[bucket] += 1
+        writer.add(ids, prompt_len)
+        if writer.tokens >= self.shard_tokens:
+            self._close(bucket)
+
+    def _close(self, bucket: int) -> None:
+        entry = self._open.pop(bucket).close()
+        entry["bucket"] = bucket
+        self.shards.append(entry)
+
+    def close(self) -> List[Dict[str, Any]]:
+        for bucket in list(self._open):
+            self._close(bucket)
+        return self.shards
+
+
+# ---------------------------------------------------------------- building
+
+def _encode(tokenizer, texts: List[str]) -> List[List[int]]:
+    if callable(tokenizer):
+        return tokenizer(texts, add_special_tokens=False)["input_ids"]
+    return [tokenizer.encode(text, add_special_tokens=False) for text in texts]
+
+
+def _render_prompt(tokenizer, prompt: str) -> str:
+    if getattr(tokenizer, "chat_template", None):
+        return tokenizer.apply_chat_template(
+            [{"role": "user", "content": prompt}], tokenize=False, add_generation_prompt=True
+        )
+    return prompt + "\n"
+
+
+def build_partition(db_path: Path, out_dir: Path, config: DistillConfig,
+                    start_id: int, end_id: int, name: str,
+                    partition: Optional[Tuple[int, int]] = None,
+                    total_id_range: Optional[Tuple[int, int]] = None) -> Dict[str, Any]:
+    """Stream rows with start_id < id <= end_id into shards named <name>-b<bucket>-NNNNN.
+
+    `partition` (I, N) and the `total_id_range` that was split are recorded so merging can
+    check every part comes from the same plan.
+    """
+    from transformers import AutoTokenizer
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(config.tokenizer)
+    eos = getattr(tokenizer, "eos_token_id", None)
+    dtype = token_dtype(tokenizer)
+    shards = BucketedShards(out_dir, name, config.buckets, config.shard_tokens, dtype)
+    stats: Counter = Counter()
+
+    hasher = None
+    if config.dedup == "minhash":
+        hasher = MinHasher(seed=config.seed)
+        dedup = NearDuplicateIndex(bands=16, similarity=config.similarity, capacity=config.dedup_window)
+    elif config.dedup == "embedding":
+        dedup = NearDuplicateIndex(bands=8, similarity=config.similarity, capacity=config.dedup_window)
+    elif config.dedup != "none":
+        raise ValueError(f"Unknown dedup method: {config.dedup}")
+
+    for rows in iter_memories(db_path, start_id, end_id, config.batch_size):
+        stats["read"] += len(rows)
+        examples, embeddings = [], []
+        for _, content, metadata, embedding in rows:
+            metadata = json.loads(metadata or "{}")
+            example = trace_example(content, metadata)
+            if example is None:
+                stats["not_trace"] += 1
+            elif not keep_outcome(metadata, config.outcome):
+                stats["filtered_outcome"] += 1
+            else:
+                examples.append(example)
+                embeddings.append(embedding)
+        if not examples:
+            continue
+
+        if config.dedup != "none":
+            if config.dedup == "embedding":
+                vectors = np.stack([np.frombuffer(blob, dtype=np.float32) for blob in embeddings])
+                if hasher is None:
+                    hasher = SimHasher(vectors.shape[1], seed=config.seed)
+                signatures = hasher(vectors)
+            else:
+                signatures = hasher([prompt + "\n" + completion for prompt, completion in examples])
+            unique = [ex for ex, sig in zip(examples, signatures) if dedup.add_if_new(sig)]
+            stats["duplicates"] += len(examples) - len(unique)
+            examples = unique
+
+        prompt_ids = _encode(tokenizer, [_render_prompt(tokenizer, prompt) for prompt, _ in examples])
+        completion_ids = _encode(tokenizer, [completion for _, completion in examples])
+        for p_ids, c_ids in zip(prompt_ids, completion_ids):
+            ids = list(p_ids) + list(c_ids) + ([eos] if eos is not None else [])
+            bucket = shards.bucket_for(len(ids))
+            if bucket is None:
+                stats["too_long"] += 1
+                continue
+            shards.add(np.asarray(ids, dtype=np.int64), len(p_ids), bucket)
+            stats["written"] += 1
+            stats["tokens"] += len(ids)
+
+    part = {
+        "format": FORMAT,
+        "name": name,
+        "id_range": [start_id, end_id],
+        "partition": list(partition) if partition else None,
+        "total_id_range": list(total_id_range) if total_id_range else None,
+        "dtype": dtype.name,
+        "tokenizer": config.tokenizer,
+        "config": config.model_dump(),
+        "shards": shards.close(),
+        "stats": dict(stats),
+    }
+    (out_dir / f"{name}.json").write_text(json.dumps(part, indent=2))
+    return part
+
+
+def _build_partition(args: tuple) -> Dict[str, Any]:
+    return build_partition(*args)
+
+
+def clear_parts(out_dir: Path) -> None:
+    """Remove part manifests, shards and index.json left in out_dir by an earlier build"""
+    for path in [*out_dir.glob("part-*"), out_dir / "index.json"]:
+        if path.is_file():
+            path.unlink()
+
+
+def _check_plan(parts: List[Dict[str, Any]]) -> None:
+    planned = [part for part in parts if part.get("partition")]
+    plans = {(part["partition"][1], tuple(part["total_id_range"] or ())) for part in planned}
+    if len(plans) > 1:
+        raise ValueError(f"Partitions were split differently (N, id range): {sorted(plans)}")
+    if plans:
+        (n, total), = plans
+        missing = sorted(set(range(n)) - {part["partition"][0] for part in planned})
+        if missing or len(planned) != n:
+            raise ValueError(f"Expected partitions 0..{n - 1} of id range {list(total)} once each, missing {missing}")
+
+
+def merge_manifests(out_dir: Path, names: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Combine part manifests into index.json (written last: its presence marks a complete build).
+
+    `names` limits the merge to those parts; by default every part-*.json in out_dir is used.
+    """
+    paths = [out_dir / f"{name}.json" for name in names] if names is not None else sorted(out_dir.glob("part-*.json"))
+    parts = [json.loads(path.read_text()) for path in paths]
+    if not parts:
+        raise FileNotFoundError(f"No part-*.json manifests in {out_dir}")
+    _check_plan(parts)
+    dtypes = {part["dtype"] for part in parts}
+    if len(dtypes) > 1:
+        raise ValueError(f"Partitions were built with different token dtypes: {sorted(dtypes)}")
+
+    stats: Counter = Counter()
+    for part in parts:
+        stats.update(part["stats"])
+    index = {
+        "format": FORMAT,
+        "dtype": parts[0]["dtype"],
+        "tokenizer": parts[0]["tokenizer"],
+        "config": parts[0]["config"],
+        "partitions": [part["name"] for part in parts],
+        "shards": [shard for part in parts for shard in part["shards"]],
+        "stats": dict(stats),
+    }
+    (out_dir / "index.json").write_text(json.dumps(index, indent=2))
+    return index
+
+
+def build_dataset(memvault_dir: Path, out_dir: Path, config: Optional[DistillConfig] = None,
+                  workers: int = 1) -> Dict[str, Any]:
+    """Build shards from a MemVault directory using `workers` processes, one id range each.
+
+    Near-duplicates are removed within each partition; copies that land in different
+    partitions are kept. Parts left in out_dir by an earlier build are removed first.
+    """
+    config = config or DistillConfig()
+    db_path = Path(memvault_dir) / "memory.db"
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    clear_parts(out_dir)
+
+    total = id_range(db_path)
+    ranges = split_id_range(*total, max(1, workers))
+    jobs = [
+        (db_path, out_dir, config, lo, hi, f"part-{i:04d}", (i, len(ranges)), total)
+        for i, (lo, hi) in enumerate(ranges)
+    ]
+    if len(jobs) == 1:
+        build_partition(*jobs[0])
+    else:
+        with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+            list(pool.map(_build_partition, jobs))
+    return merge_manifests(out_dir, [job[5] for job in jobs])
+
+
+# ---------------------------------------------------------------- reading shards
+
+class ShardedDataset:
+    """Memory-mapped access to a built dataset; optionally restricted to one length bucket"""
+
+    def __init__(self, out_dir: Path, bucket: Optional[int] = None):
+        self.out_dir = Path(out_dir)
+        self.manifest = json.loads((self.out_dir / "index.json").read_text())
+        self.dtype = np.dtype(self.manifest["dtype"])
+        self.shards = [s for s in self.manifest["shards"] if bucket is None or s["bucket"] == bucket]
+        self._cumulative = np.cumsum([0] + [s["sequences"] for s in self.shards])
+        self._maps: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return int(self._cumulative[-1])
+
+    def _shard(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        if i not in self._maps:
+            shard = self.shards[i]
+            tokens = np.memmap(self.out_dir / shard["bin"], dtype=self.dtype, mode="r")
+            self._maps[i] = (tokens, np.load(self.out_dir / shard["index"], mmap_mode="r"))
+        return self._maps[i]
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        shard = int(np.searchsorted(self._cumulative, i, side="right")) - 1
+        tokens, index = self._shard(shard)
+        start, length, prompt_len = index[i - self._cumulative[shard]]
+        return {"input_ids": np.asarray(tokens[start:start + length]), "prompt_len": int(prompt_len)}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build tokenized training shards from MemVault traces")
+    parser.add_argument("--memvault", default="./aurora_memory", help="MemVault persist_dir (contains memory.db)")
+    parser.add_argument("--out", default="./forge_data")
+    parser.add_argument("--tokenizer", default=DistillConfig().tokenizer)
+    parser.add_argument("--outcome", choices=["success", "failure", "any"], default="success")
+    parser.add_argument("--dedup", choices=["embedding", "minhash", "none"], default="embedding")
+    parser.add_argument("--similarity", type=float, default=0.9)
+    parser.add_argument("--dedup-window", type=int, default=DistillConfig().dedup_window)
+    parser.add_argument("--buckets", default=",".join(map(str, DistillConfig().buckets)))
+    parser.add_argument("--shard-tokens", type=int, default=DistillConfig().shard_tokens)
+    parser.add_argument("--batch-size", type=int, default=512)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--partition", help="build only partition I of N (e.g. 3/8); merge later with --merge")
+    parser.add_argument("--id-range", help="LO:HI row-id range that --partition splits (default: the vault's current "
+                        "range, which drifts as memories are added; pass the same value on every machine)")
+    parser.add_argument("--merge", action="store_true", help="only merge existing part-*.json into index.json")
+    args = parser.parse_args(argv)
+
+    out_dir = Path(args.out)
+    if args.merge:
+        index = merge_manifests(out_dir)
+    else:
+        config = DistillConfig(
+            tokenizer=args.tokenizer, outcome=args.outcome, dedup=args.dedup, similarity=args.similarity,
+            dedup_window=args.dedup_window, buckets=[int(b) for b in args.buckets.split(",")],
+            shard_tokens=args.shard_tokens, batch_size=args.batch_size,
+        )
+        if args.partition:
+            i, n = (int(x) for x in args.partition.split("/"))
+            if not 0 <= i < n:
+                parser.error(f"--partition {args.partition}: I must be in 0..N-1")
+            db_path = Path(args.memvault) / "memory.db"
+            total = tuple(int(x) for x in args.id_range.split(":")) if args.id_range else id_range(db_path)
+            lo, hi = split_id_range(*total, n)[i]
+            print(f"📦 partition {i}/{n}: ids ({lo}, {hi}] of --id-range {total[0]}:{total[1]}", file=sys.stderr)
+            index = build_partition(db_path, out_dir, config, lo, hi, f"part-{i:04d}", (i, n), total)
+        else:
+            index = build_dataset(Path(args.memvault), out_dir, config, workers=args.workers)
+
+    print(f"✅ {json.dumps(index['stats'])}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
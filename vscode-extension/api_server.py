@@ -1,24 +1,61 @@
 # vscode-extension/api_server.py
-from flask import Flask, request, jsonify
-from demo import main as run_agent
+import os
+import threading
+from pathlib import Path
+
+from flask import Flask, Response, request, jsonify
+
+from agents.executive_agent import ExecutiveAgent
+from agents.tools.shell_tool import ShellTool
+from agents.tools.web_browse import WebBrowseTool
+from core import tracing
+from core.aurora_base import AuroraBase
+from core.memvault_service import connect_memvault
 
 app = Flask(__name__)
 
+# Serving /metrics means we want them; AURORA_TRACING=0 still opts out
+if os.environ.get("AURORA_TRACING", "1").lower() not in ("0", "false", "no"):
+    tracing.enable()
+
+_agent = None
+# vLLM's offline engine isn't thread-safe: one agent run at a time (also guards the lazy build)
+_agent_lock = threading.Lock()
+
+
+def _build_agent() -> ExecutiveAgent:
+    """Same stack as demo.py; models load on the first /agent request, not at import"""
+    llm = AuroraBase(
+        model_id=os.environ.get("AURORA_MODEL_ID", "Qwen/Qwen2.5-7B-Instruct"),
+        quantization="awq",
+        max_model_len=32768,
+    )
+    memory = connect_memvault(
+        persist_dir=Path(os.environ.get("AURORA_MEMVAULT_DIR", "./aurora_memory")),
+        embedding_model="sentence-transformers/all-MiniLM-L6-v2",
+    )
+    tools = [ShellTool(sandboxed=True), WebBrowseTool(headless=True)]
+    return ExecutiveAgent(llm=llm, tools=tools, memory=memory, max_iterations=5)
+
+
 @app.route('/agent', methods=['POST'])
 def agent():
+    global _agent
     data = request.get_json()
     goal = data.get('goal', '')
 
-    # Here you’d call the actual agent — for demo, we simulate
-    # In real impl, you’d import ExecutiveAgent and run it
-    result = {
-        "goal": goal,
-        "audit": "✅ Goal achieved. No unsafe actions. Output complete.",
-        "steps": [{"number": 1, "description": "Generated code"}],
-        "outputs": [{"success": True, "output": "print('Hello from AURORA')"}]
-    }
+    # Plan, run each step with a tool, self-audit; spans feed /metrics (and AURORA_TRACE_DIR traces)
+    with _agent_lock:
+        if _agent is None:
+            _agent = _build_agent()
+        result = _agent.run(goal)
 
     return jsonify(result)
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus scrape endpoint (span latency histograms, token + cache counters)"""
+    return Response(tracing.render_prometheus(), mimetype="text/plain; version=0.0.4")
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000)